@@ -258,6 +258,7 @@ async def merge_worktree(
     Integrates all changes from the worktree's branch into the main branch.
     May return conflict error if merge conflicts are detected.
     """
+    manager = None
     try:
         manager = await get_worktree_manager(project_id, db)
 
@@ -282,6 +283,10 @@ async def merge_worktree(
     except Exception as e:
         logger.error(f"Failed to merge worktree: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        # Write pending status updates and stop helper git processes
+        if manager is not None:
+            await manager.close()
 
 
 @router.get("/api/projects/{project_id}/worktrees/{epic_id}/conflicts", response_model=ConflictListResponse)
@@ -295,6 +300,7 @@ async def get_conflicts(
 
     Returns list of files with conflicts and their conflict types.
     """
+    manager = None
     try:
         manager = await get_worktree_manager(project_id, db)
 
@@ -316,6 +322,10 @@ async def get_conflicts(
     except Exception as e:
         logger.error(f"Failed to get conflicts: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        # Write pending status updates and stop helper git processes
+        if manager is not None:
+            await manager.close()
 
 
 @router.post("/api/projects/{project_id}/worktrees/{epic_id}/resolve", response_model=ResolveResponse)
@@ -333,6 +343,7 @@ async def resolve_conflicts(
     - 'theirs': Keep changes from worktree branch
     - 'manual': Leave conflict markers for human resolution
     """
+    manager = None
     try:
         manager = await get_worktree_manager(project_id, db)
 
@@ -368,6 +379,10 @@ async def resolve_conflicts(
     except Exception as e:
         logger.error(f"Failed to resolve conflicts: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        # Write pending status updates and stop helper git processes
+        if manager is not None:
+            await manager.close()
 
 
 @router.delete("/api/projects/{project_id}/worktrees/{epic_id}")
@@ -381,6 +396,7 @@ async def cleanup_worktree(
 
     Removes the worktree directory and cleans up associated branches.
     """
+    manager = None
     try:
         manager = await get_worktree_manager(project_id, db)
 
@@ -395,6 +411,10 @@ async def cleanup_worktree(
     except Exception as e:
         logger.error(f"Failed to cleanup worktree: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        # Write pending status updates and stop helper git processes
+        if manager is not None:
+            await manager.close()
 
 
 @router.post("/api/projects/{project_id}/worktrees/{epic_id}/sync", response_model=SyncResponse)
@@ -413,6 +433,7 @@ async def sync_worktree(
     - 'merge': Merge main branch changes into worktree (default)
     - 'rebase': Rebase worktree changes onto main
     """
+    manager = None
     try:
         manager = await get_worktree_manager(project_id, db)
 
@@ -435,3 +456,7 @@ async def sync_worktree(
     except Exception as e:
         logger.error(f"Failed to sync worktree: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        # Write pending status updates and stop helper git processes
+        if manager is not None:
+            await manager.close()
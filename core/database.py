@@ -86,7 +86,7 @@ class TaskDatabase:
         self,
         name: str,
         spec_file_path: str,
-        spec_content: Optional[str] = None,
+        spec_content: Optional[Union[str, bytes]] = None,
         user_id: Optional[UUID] = None
     ) -> Dict[str, Any]:
         """
@@ -95,7 +95,8 @@ class TaskDatabase:
         Args:
             name: Unique project name
             spec_file_path: Path to specification file
-            spec_content: Content of spec file (for hash calculation)
+            spec_content: Content of spec file (for hash calculation), as text
+                          or a bytes-like buffer of the UTF-8 file contents
             user_id: Optional user ID for multi-user support
 
         Returns:
@@ -103,7 +104,9 @@ class TaskDatabase:
         """
         spec_hash = None
         if spec_content:
-            spec_hash = hashlib.sha256(spec_content.encode()).hexdigest()
+            if isinstance(spec_content, str):
+                spec_content = spec_content.encode()
+            spec_hash = hashlib.sha256(spec_content).hexdigest()
 
         async with self.acquire() as conn:
             row = await conn.fetchrow(
@@ -25,6 +25,7 @@ Pricing (approximate, as of 2025):
 """
 
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Dict, Optional, Any, Tuple
 from uuid import UUID
 from enum import Enum
@@ -33,6 +34,7 @@ from collections import defaultdict
 import logging
 import asyncio
 import json
+import re
 
 logger = logging.getLogger(__name__)
 
@@ -68,6 +70,25 @@ PERFORMANCE_MIN_SAMPLES = 3  # Minimum samples needed to influence recommendatio
 PERFORMANCE_SUCCESS_THRESHOLD = 0.7  # 70% success rate threshold
 
 
+# Task type keyword patterns in priority order (most specific first). Keywords
+# match as case-insensitive substrings, so 'test' also matches 'testing'.
+TASK_TYPE_PATTERNS = tuple(
+    (task_type, re.compile('|'.join(map(re.escape, keywords)), re.IGNORECASE))
+    for task_type, keywords in (
+        ('database', ['database', 'schema', 'migration', 'sql', 'query']),
+        ('api', ['api', 'endpoint', 'route', 'rest', 'graphql']),
+        ('frontend', ['frontend', 'ui', 'component', 'react', 'vue', 'angular']),
+        ('backend', ['backend', 'server', 'service']),
+        ('testing', ['test', 'unit test', 'integration test', 'e2e']),
+        ('refactor', ['refactor', 'cleanup', 'reorganize']),
+        ('documentation', ['document', 'readme', 'docs', 'comment']),
+        ('security', ['security', 'auth', 'authentication', 'authorization']),
+        ('performance', ['performance', 'optimize', 'cache', 'speed']),
+        ('deployment', ['deploy', 'ci/cd', 'docker', 'kubernetes']),
+    )
+)
+
+
 @dataclass
 class ModelRecommendation:
     """
@@ -85,11 +106,13 @@ class ModelRecommendation:
     complexity: Optional['TaskComplexity'] = None
 
 
-@dataclass
+@dataclass(frozen=True)
 class TaskComplexity:
     """
     Task complexity analysis.
 
+    Frozen because ModelSelector caches and shares instances per task text.
+
     Attributes:
         reasoning_depth: Multi-step logic required (0-1)
         code_complexity: Lines and files involved (0-1)
@@ -143,54 +166,10 @@ class ModelSelector:
         """
         description = task.get('description', '').lower()
         action = task.get('action', '').lower()
-        combined_text = f"{description} {action}"
-
-        # Score reasoning_depth (0-1): multi-step logic, algorithm design, architecture decisions
-        reasoning_depth = self._score_reasoning_depth(combined_text)
-
-        # Score code_complexity (0-1): LOC estimate, number of files, new vs modify
-        code_complexity = self._score_code_complexity(combined_text)
-
-        # Score domain_specificity (0-1): specialized knowledge required
-        domain_specificity = self._score_domain_specificity(combined_text)
+        return _analyze_text(f"{description} {action}")
 
-        # Score context_requirements (0-1): dependencies, existing code understanding
-        context_requirements = self._score_context_requirements(combined_text)
-
-        # Calculate weighted overall_score
-        weights = {
-            'reasoning_depth': 0.35,
-            'code_complexity': 0.30,
-            'domain_specificity': 0.20,
-            'context_requirements': 0.15
-        }
-
-        overall_score = (
-            reasoning_depth * weights['reasoning_depth'] +
-            code_complexity * weights['code_complexity'] +
-            domain_specificity * weights['domain_specificity'] +
-            context_requirements * weights['context_requirements']
-        )
-
-        # Clamp to [0.0, 1.0]
-        overall_score = max(0.0, min(1.0, overall_score))
-
-        logger.debug(
-            f"Task complexity analysis: "
-            f"reasoning={reasoning_depth:.2f}, code={code_complexity:.2f}, "
-            f"domain={domain_specificity:.2f}, context={context_requirements:.2f}, "
-            f"overall={overall_score:.2f}"
-        )
-
-        return TaskComplexity(
-            reasoning_depth=reasoning_depth,
-            code_complexity=code_complexity,
-            domain_specificity=domain_specificity,
-            context_requirements=context_requirements,
-            overall_score=overall_score
-        )
-
-    def _score_reasoning_depth(self, text: str) -> float:
+    @staticmethod
+    def _score_reasoning_depth(text: str) -> float:
         """
         Score reasoning depth required (0-1).
 
@@ -239,7 +218,8 @@ class ModelSelector:
         # Clamp to [0.0, 1.0]
         return max(0.0, min(1.0, score))
 
-    def _score_code_complexity(self, text: str) -> float:
+    @staticmethod
+    def _score_code_complexity(text: str) -> float:
         """
         Score code complexity (0-1).
 
@@ -282,7 +262,8 @@ class ModelSelector:
         # Clamp to [0.0, 1.0]
         return max(0.0, min(1.0, score))
 
-    def _score_domain_specificity(self, text: str) -> float:
+    @staticmethod
+    def _score_domain_specificity(text: str) -> float:
         """
         Score domain-specific knowledge required (0-1).
 
@@ -324,7 +305,8 @@ class ModelSelector:
         # Clamp to [0.0, 1.0]
         return max(0.0, min(1.0, score))
 
-    def _score_context_requirements(self, text: str) -> float:
+    @staticmethod
+    def _score_context_requirements(text: str) -> float:
         """
         Score existing code understanding required (0-1).
 
@@ -1057,24 +1039,8 @@ class ModelSelector:
         Returns:
             Task type category (e.g., 'api', 'database', 'frontend', 'refactor', 'general')
         """
-        desc_lower = task_description.lower()
-
-        # Define task type patterns in priority order (most specific first)
-        task_types = [
-            ('database', ['database', 'schema', 'migration', 'sql', 'query']),
-            ('api', ['api', 'endpoint', 'route', 'rest', 'graphql']),
-            ('frontend', ['frontend', 'ui', 'component', 'react', 'vue', 'angular']),
-            ('backend', ['backend', 'server', 'service']),
-            ('testing', ['test', 'unit test', 'integration test', 'e2e']),
-            ('refactor', ['refactor', 'cleanup', 'reorganize']),
-            ('documentation', ['document', 'readme', 'docs', 'comment']),
-            ('security', ['security', 'auth', 'authentication', 'authorization']),
-            ('performance', ['performance', 'optimize', 'cache', 'speed']),
-            ('deployment', ['deploy', 'ci/cd', 'docker', 'kubernetes']),
-        ]
-
-        for task_type, keywords in task_types:
-            if any(keyword in desc_lower for keyword in keywords):
+        for task_type, pattern in TASK_TYPE_PATTERNS:
+            if pattern.search(task_description):
                 return task_type
 
         return 'general'
@@ -1111,3 +1077,58 @@ class ModelSelector:
             f"Task {task_id} outcome: model={model}, success={success}, "
             f"duration={duration:.2f}s, tokens={tokens.get('input_tokens', 0) + tokens.get('output_tokens', 0)}"
         )
+
+
+@lru_cache(maxsize=1024)
+def _analyze_text(combined_text: str) -> TaskComplexity:
+    """
+    Score combined description/action text (memoized).
+
+    The scores depend only on the text, so tasks with the same wording
+    (retries, re-planning, repeated recommendations) are scored once,
+    whichever ModelSelector asks.
+    """
+    # Score reasoning_depth (0-1): multi-step logic, algorithm design, architecture decisions
+    reasoning_depth = ModelSelector._score_reasoning_depth(combined_text)
+
+    # Score code_complexity (0-1): LOC estimate, number of files, new vs modify
+    code_complexity = ModelSelector._score_code_complexity(combined_text)
+
+    # Score domain_specificity (0-1): specialized knowledge required
+    domain_specificity = ModelSelector._score_domain_specificity(combined_text)
+
+    # Score context_requirements (0-1): dependencies, existing code understanding
+    context_requirements = ModelSelector._score_context_requirements(combined_text)
+
+    # Calculate weighted overall_score
+    weights = {
+        'reasoning_depth': 0.35,
+        'code_complexity': 0.30,
+        'domain_specificity': 0.20,
+        'context_requirements': 0.15
+    }
+
+    overall_score = (
+        reasoning_depth * weights['reasoning_depth'] +
+        code_complexity * weights['code_complexity'] +
+        domain_specificity * weights['domain_specificity'] +
+        context_requirements * weights['context_requirements']
+    )
+
+    # Clamp to [0.0, 1.0]
+    overall_score = max(0.0, min(1.0, overall_score))
+
+    logger.debug(
+        f"Task complexity analysis: "
+        f"reasoning={reasoning_depth:.2f}, code={code_complexity:.2f}, "
+        f"domain={domain_specificity:.2f}, context={context_requirements:.2f}, "
+        f"overall={overall_score:.2f}"
+    )
+
+    return TaskComplexity(
+        reasoning_depth=reasoning_depth,
+        code_complexity=code_complexity,
+        domain_specificity=domain_specificity,
+        context_requirements=context_requirements,
+        overall_score=overall_score
+    )
@@ -19,7 +19,7 @@ Design Philosophy:
 
 import asyncio
 from pathlib import Path
-from typing import Optional, Dict, Any, List, Callable, Awaitable, TYPE_CHECKING
+from typing import Optional, Dict, Any, List, Callable, Awaitable, Union, TYPE_CHECKING
 from datetime import datetime
 from uuid import UUID
 import logging
@@ -89,7 +89,7 @@ class AgentOrchestrator:
         self,
         project_name: str,
         spec_source: Optional[Path] = None,
-        spec_content: Optional[str] = None,
+        spec_content: Optional[Union[str, bytes]] = None,
         user_id: Optional[UUID] = None,
         force: bool = False,
         sandbox_type: str = "docker",
@@ -103,7 +103,7 @@ class AgentOrchestrator:
         Args:
             project_name: Name for the project (must be unique)
             spec_source: Path to spec file or folder (optional)
-            spec_content: Spec content as string (optional)
+            spec_content: Spec content as string or UTF-8 bytes-like buffer (optional)
             user_id: User ID (optional, for future multi-user support)
             force: If True, overwrite existing project
             sandbox_type: Sandbox type (docker or local), default: docker
@@ -167,7 +167,10 @@ class AgentOrchestrator:
                     copy_spec_to_project(project_path, spec_source)
                 elif spec_content:
                     # Write spec_content to app_spec.txt if no source file provided
-                    (project_path / "app_spec.txt").write_text(spec_content, encoding='utf-8')
+                    if isinstance(spec_content, str):
+                        (project_path / "app_spec.txt").write_text(spec_content, encoding='utf-8')
+                    else:
+                        (project_path / "app_spec.txt").write_bytes(spec_content)
 
             # Create project in database
             project = await db.create_project(
@@ -494,6 +497,9 @@ class AgentOrchestrator:
         # Auto-continue loop for coding sessions
         iteration = 0
         last_session = None
+        # Progress read after a session doubles as the next iteration's
+        # pre-check; nothing runs between the two reads.
+        progress = None
 
         while True:
             # Check max_iterations
@@ -510,23 +516,25 @@ class AgentOrchestrator:
                 break
 
             # Check if all epics are complete (more reliable than checking tasks)
-            async with DatabaseManager() as db:
-                progress = await db.get_progress(project_id)
-                if progress:
-                    completed_epics = progress.get('completed_epics', 0)
-                    total_epics = progress.get('total_epics', 0)
-                    logger.info(f"Auto-continue check: {completed_epics}/{total_epics} epics complete")
-                    if completed_epics == total_epics and total_epics > 0:
-                        logger.info(f"[OK] All epics complete ({completed_epics}/{total_epics}). Stopping auto-continue.")
-                        # Notify via callback
-                        if self.event_callback:
-                            await self.event_callback(project_id, "all_epics_complete", {
-                                "completed_epics": completed_epics,
-                                "total_epics": total_epics,
-                                "completed_tasks": progress.get('completed_tasks', 0),
-                                "total_tasks": progress.get('total_tasks', 0)
-                            })
-                        break
+            if progress is None:
+                async with DatabaseManager() as db:
+                    progress = await db.get_progress(project_id)
+            if progress:
+                completed_epics = progress.get('completed_epics', 0)
+                total_epics = progress.get('total_epics', 0)
+                logger.info(f"Auto-continue check: {completed_epics}/{total_epics} epics complete")
+                if completed_epics == total_epics and total_epics > 0:
+                    logger.info(f"[OK] All epics complete ({completed_epics}/{total_epics}). Stopping auto-continue.")
+                    # Notify via callback
+                    if self.event_callback:
+                        await self.event_callback(project_id, "all_epics_complete", {
+                            "completed_epics": completed_epics,
+                            "total_epics": total_epics,
+                            "completed_tasks": progress.get('completed_tasks', 0),
+                            "total_tasks": progress.get('total_tasks', 0)
+                        })
+                    break
+            progress = None
 
             iteration += 1
 
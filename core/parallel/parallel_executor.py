@@ -29,11 +29,13 @@ from core.learning import ExpertiseManager, ModelSelector
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ExecutionResult:
     """
     Result of a task execution.
 
+    Slotted and immutable: batches build one per task and never modify them.
+
     Attributes:
         task_id: Task ID that was executed
         success: Whether execution succeeded
@@ -105,7 +107,9 @@ class ParallelExecutor:
         self.worktree_manager = WorktreeManager(
             project_path=project_path,
             project_id=project_id,
-            db=db_connection
+            db=db_connection,
+            # execute_batch() marks each worktree dirty before an agent runs in it
+            track_changes=True
         )
         self.dependency_resolver = DependencyResolver(db_connection=db_connection)
         self.expertise_manager = ExpertiseManager(
@@ -115,8 +119,9 @@ class ParallelExecutor:
         # ModelSelector will be initialized when needed (requires config)
         self.model_selector: Optional[ModelSelector] = None
 
-        # Initialize concurrency control
-        self.semaphore = asyncio.Semaphore(max_concurrency)
+        # Initialize concurrency control. Bounded so a stray release() raises
+        # instead of silently letting more than max_concurrency agents run.
+        self.semaphore = asyncio.BoundedSemaphore(max_concurrency)
         self.cancel_event = asyncio.Event()
 
         # Track running agents
@@ -176,17 +181,22 @@ class ParallelExecutor:
 
             logger.info(f"Resolved into {len(dependency_graph.batches)} batches")
 
-            # Create batch records in database
+            # Create batch records in database and initialize the worktree
+            # manager concurrently; the inserts are independent of each other
+            # and of worktree setup (batches are read back by batch_number)
+            await asyncio.gather(
+                *(
+                    self.db.create_parallel_batch(
+                        project_id=self.project_id,
+                        batch_number=batch_number,
+                        task_ids=task_ids
+                    )
+                    for batch_number, task_ids in enumerate(dependency_graph.batches, start=1)
+                ),
+                self.worktree_manager.initialize()
+            )
             for batch_number, task_ids in enumerate(dependency_graph.batches, start=1):
-                await self.db.create_parallel_batch(
-                    project_id=self.project_id,
-                    batch_number=batch_number,
-                    task_ids=task_ids
-                )
                 logger.info(f"Created batch {batch_number} with {len(task_ids)} tasks")
-
-            # Initialize worktree manager
-            await self.worktree_manager.initialize()
             logger.info("Worktree manager initialized")
 
             # Process batches sequentially (batch N must complete before batch N+1)
@@ -258,6 +268,9 @@ class ParallelExecutor:
                     pass
                 logger.info("Stopped periodic agent status updates")
 
+            # Stop long-lived git helper processes
+            await self.worktree_manager.close()
+
     async def execute_batch(self, batch_number: int, task_ids: List[int]) -> List[ExecutionResult]:
         """
         Execute a single batch of tasks in parallel.
@@ -332,6 +345,8 @@ class ParallelExecutor:
                     continue
 
                 worktree_path = worktree_paths[epic_id]
+                # The agent will write to the worktree; don't trust its clean state
+                self.worktree_manager.mark_dirty(epic_id)
                 task_coroutines.append(self._execute_task_with_semaphore(task, worktree_path))
                 executed_task_ids.append(task_id)  # Track in same order as coroutines
 
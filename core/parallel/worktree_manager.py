@@ -14,20 +14,78 @@ Key Features:
 - Syncs state with database
 """
 
-from dataclasses import dataclass
-from typing import Optional, List, Dict, Any
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import Optional, List, Dict, Any, AsyncIterator, Set, Tuple, Union
 from datetime import datetime
 from pathlib import Path
+from uuid import UUID
 import asyncio
 import logging
 import os
+import re
+import shlex
+import shutil
+import stat
+import time
+
+try:
+    import pygit2  # Optional: lists conflicted paths without spawning git
+except ImportError:
+    pygit2 = None
 
 logger = logging.getLogger(__name__)
 
+# Anything usable as a git working directory
+StrPath = Union[str, 'os.PathLike[str]']
+
+# Branch name sanitization: anything but a-z, 0-9, hyphen, dot is dropped
+_INVALID_BRANCH_CHARS = re.compile(r'[^a-z0-9\-.]')
+_MULTI_HYPHEN = re.compile(r'-+')
+
+# Windows reserved device names (CON, PRN, AUX, NUL, COM1-9, LPT1-9)
+_RESERVED_NAMES = frozenset([
+    'con', 'prn', 'aux', 'nul',
+    *[f'com{i}' for i in range(1, 10)],
+    *[f'lpt{i}' for i in range(1, 10)],
+])
+
+
+def _is_dir(path: Path) -> bool:
+    """Check that a path exists and is a directory with a single stat() call."""
+    try:
+        return stat.S_ISDIR(os.stat(path).st_mode)
+    except (FileNotFoundError, NotADirectoryError):
+        return False
+
 
 class GitCommandError(Exception):
-    """Raised when a git command fails."""
-    pass
+    """
+    Raised when a git command fails.
+
+    Attributes:
+        returncode: Git exit code (None if git never ran or timed out)
+        stdout: Raw stdout of the failed command
+        stderr: Raw stderr of the failed command
+    """
+
+    def __init__(
+        self,
+        message: str,
+        returncode: Optional[int] = None,
+        stdout: bytes = b'',
+        stderr: bytes = b''
+    ):
+        super().__init__(message)
+        self.returncode = returncode
+        self.stdout = stdout
+        self.stderr = stderr
+
+    @property
+    def is_conflict(self) -> bool:
+        """True if git exited 1 because of a merge/rebase conflict."""
+        return self.returncode == 1 and (b'CONFLICT' in self.stdout or b'CONFLICT' in self.stderr)
 
 
 class WorktreeConflictError(Exception):
@@ -47,6 +105,8 @@ class WorktreeInfo:
         status: Current status (active/merged/conflict/cleanup)
         created_at: When worktree was created
         merged_at: When worktree was merged (if applicable)
+        merged: Whether the branch has been merged into main
+        branch_deleted: Whether the branch has already been deleted
     """
     path: str
     branch: str
@@ -54,6 +114,39 @@ class WorktreeInfo:
     status: str
     created_at: datetime
     merged_at: Optional[datetime] = None
+    merged: bool = False
+    branch_deleted: bool = False
+
+    @cached_property
+    def fs_path(self) -> Path:
+        """The worktree path as a Path, built once on first use."""
+        return Path(self.path)
+
+
+@dataclass
+class GitStatus:
+    """
+    Parsed output of 'git status --porcelain=v2 --branch'.
+
+    Attributes:
+        head: Checked-out branch name (None if HEAD is detached)
+        oid: Commit SHA of HEAD (None before the first commit)
+        upstream: Upstream branch name (None if not configured)
+        ahead: Commits ahead of upstream (0 without upstream)
+        behind: Commits behind upstream (0 without upstream)
+        entries: Paths with staged, unstaged, unmerged or untracked changes
+    """
+    head: Optional[str] = None
+    oid: Optional[str] = None
+    upstream: Optional[str] = None
+    ahead: int = 0
+    behind: int = 0
+    entries: List[str] = field(default_factory=list)
+
+    @property
+    def has_changes(self) -> bool:
+        """Whether the working tree has anything to commit."""
+        return bool(self.entries)
 
 
 class WorktreeManager:
@@ -64,12 +157,30 @@ class WorktreeManager:
     on different epics simultaneously without conflicts.
     """
 
+    # Max (main_sha, branch_sha) pairs kept in the merge-tree result cache
+    CONFLICT_CACHE_SIZE = 128
+
+    # Seconds a worktree known to be clean (and not marked dirty) is trusted
+    # without running git status again, when the manager tracks changes
+    CLEAN_STATUS_TTL = 5.0
+
+    # Config overrides passed to every git call: no auto-gc checks or
+    # fsmonitor IPC, untracked cache for status, protocol v2 for fetches
+    GIT_CONFIG_ARGS = [
+        '-c', 'gc.auto=0',
+        '-c', 'core.fsmonitor=false',
+        '-c', 'core.untrackedCache=true',
+        '-c', 'protocol.version=2',
+    ]
+
     def __init__(
         self,
         project_path: str,
         project_id: str,
         worktree_dir: str = ".worktrees",
-        db=None
+        db=None,
+        max_concurrent_git: Optional[int] = None,
+        track_changes: bool = False
     ):
         """
         Initialize worktree manager.
@@ -79,12 +190,72 @@ class WorktreeManager:
             project_id: Project UUID
             worktree_dir: Directory for worktrees (relative to project root)
             db: Database connection (optional, for state persistence)
+            max_concurrent_git: Maximum number of git processes running at once
+                (defaults to CPU count, clamped to 4-16)
+            track_changes: Caller promises to call mark_dirty() before anything
+                writes to a worktree, so a recently verified clean state can
+                be trusted without git status. Off by default, which always
+                runs status before merging or syncing.
         """
         self.project_path = Path(project_path)
+        self._project_dir = os.fspath(self.project_path)  # default git cwd, as a string once
         self.project_id = project_id
         self.worktree_dir = worktree_dir
+        self._worktree_root = self.project_path / worktree_dir
         self.db = db
         self._worktrees: Dict[int, WorktreeInfo] = {}  # epic_id -> WorktreeInfo
+
+        # Cap concurrent git spawns so many parallel epics can't fork-storm
+        if max_concurrent_git is None:
+            max_concurrent_git = max(4, min(os.cpu_count() or 4, 16))
+        self._git_sem = asyncio.Semaphore(max_concurrent_git)
+
+        # Force untranslated git messages so CONFLICT markers are locale-independent
+        self._git_env = {**os.environ, 'LC_ALL': 'C'}
+
+        # Spawn git by absolute path, with no cwd and close_fds=False, so
+        # subprocess can use posix_spawn instead of fork+exec (much cheaper
+        # from a large Python process). The working directory is passed via
+        # 'git -C' instead. Python's own fds are non-inheritable (PEP 446),
+        # so close_fds=False leaks nothing but the pipes git needs.
+        self._git_executable = shutil.which('git') or 'git'
+        self._spawn_kwargs: Dict[str, Any] = {'close_fds': False} if os.name == 'posix' else {}
+
+        # (main_sha, branch_sha) -> (has_conflicts, merge-tree output), LRU ordered
+        self._conflict_cache: "OrderedDict[Tuple[str, str], Tuple[bool, str]]" = OrderedDict()
+        self._conflict_cache_keys: Dict[str, Tuple[str, str]] = {}  # branch -> last key
+
+        # Main branch is fixed for the repo's lifetime; resolved once and reused.
+        # origin/HEAD's mtime at resolution time is kept as a cheap staleness check.
+        self._main_branch: Optional[str] = None
+        self._main_branch_mtime: Optional[int] = None
+        self._main_branch_lock = asyncio.Lock()
+
+        # epic_id -> whether the worktree may have changed since it was last
+        # known clean, and when that was (time.monotonic()). Only consulted
+        # when the caller opted in with track_changes.
+        self.track_changes = track_changes
+        self._dirty: Dict[int, bool] = {}
+        self._clean_checked_at: Dict[int, float] = {}
+
+        # Long-lived 'git cat-file --batch-check' answering ref lookups over
+        # stdin/stdout; started on first use, one query at a time
+        self._catfile_proc: Optional[asyncio.subprocess.Process] = None
+        self._catfile_lock = asyncio.Lock()
+
+        # Local branch names (refs/heads), loaded by initialize()/refresh() and
+        # kept current as branches are created and deleted. None until loaded.
+        self._known_branches: Optional[Set[str]] = None
+
+        # Status updates are written to the database in the background so git
+        # operations return without waiting on it. Updates for one epic are
+        # chained (epic_id -> its latest task) so they land in order.
+        self._pending_db_tasks: Set[asyncio.Task] = set()
+        self._db_update_tails: Dict[int, asyncio.Task] = {}
+
+        # Serialized get_worktree_status() result; None when _worktrees (or a
+        # worktree's status) changed since it was built
+        self._status_cache: Optional[Dict[str, Any]] = None
         logger.info(f"WorktreeManager initialized for project {project_id}")
 
     async def initialize(self) -> None:
@@ -94,25 +265,56 @@ class WorktreeManager:
         existing worktree state from the database.
         """
         # Create worktrees directory
-        worktree_path = self.project_path / self.worktree_dir
-        worktree_path.mkdir(parents=True, exist_ok=True)
-        logger.info(f"Worktree directory initialized at {worktree_path}")
+        self._worktree_root.mkdir(parents=True, exist_ok=True)
+        logger.info(f"Worktree directory initialized at {self._worktree_root}")
+
+        # Prime the main branch cache so later create/merge/sync calls skip detection
+        try:
+            await self._get_main_branch()
+        except GitCommandError as e:
+            logger.debug(f"Could not detect main branch during initialization: {e}")
+
+        await self._load_known_branches()
 
         # Load existing worktrees from database if available
         if self.db:
             try:
-                from uuid import UUID
                 worktrees_data = await self.db.list_worktrees(UUID(self.project_id))
-                for wt_data in worktrees_data:
-                    worktree_info = WorktreeInfo(
+                worktree_infos = [
+                    WorktreeInfo(
                         path=wt_data['worktree_path'],
                         branch=wt_data['branch_name'],
                         epic_id=wt_data['epic_id'],
                         status=wt_data['status'],
                         created_at=wt_data['created_at'],
-                        merged_at=wt_data.get('merged_at')
+                        merged_at=wt_data.get('merged_at'),
+                        merged=wt_data['status'] == 'merged'
                     )
-                    self._worktrees[wt_data['epic_id']] = worktree_info
+                    for wt_data in worktrees_data
+                ]
+
+                # Validate live worktrees concurrently (one git round, bounded by
+                # _git_sem). Merged/cleaned-up records are history and kept as-is.
+                live_statuses = ('active', 'conflict')
+                validity = await asyncio.gather(
+                    *[
+                        self._is_live_worktree(wt.fs_path)
+                        for wt in worktree_infos
+                        if wt.status in live_statuses
+                    ],
+                    return_exceptions=True
+                )
+                validity_iter = iter(validity)
+
+                for worktree_info in worktree_infos:
+                    if worktree_info.status in live_statuses and next(validity_iter) is not True:
+                        logger.warning(
+                            f"Skipping stale worktree for epic {worktree_info.epic_id}: "
+                            f"{worktree_info.path} is not a valid git worktree"
+                        )
+                        continue
+                    self._worktrees[worktree_info.epic_id] = worktree_info
+                self._invalidate_status_cache()
                 logger.info(f"Loaded {len(self._worktrees)} existing worktrees from database")
             except Exception as e:
                 logger.warning(f"Could not load worktrees from database: {e}")
@@ -182,7 +384,6 @@ class WorktreeManager:
             db_worktrees = {}  # epic_id -> worktree_data mapping
             if self.db:
                 try:
-                    from uuid import UUID
                     worktrees_data = await self.db.list_worktrees(UUID(self.project_id))
                     for wt_data in worktrees_data:
                         db_worktrees[wt_data['epic_id']] = wt_data
@@ -205,9 +406,11 @@ class WorktreeManager:
                         epic_id=wt_data['epic_id'],
                         status=wt_data['status'],
                         created_at=wt_data['created_at'],
-                        merged_at=wt_data.get('merged_at')
+                        merged_at=wt_data.get('merged_at'),
+                        merged=wt_data['status'] == 'merged'
                     )
                     self._worktrees[epic_id] = worktree_info
+                    self._invalidate_status_cache()
                     recovered_count += 1
                     logger.info(f"Recovered worktree for epic {epic_id}: {worktree_path}")
                 else:
@@ -216,7 +419,6 @@ class WorktreeManager:
                     logger.warning(f"Stale database entry for epic {epic_id}, worktree not found at {worktree_path}")
                     if self.db:
                         try:
-                            from uuid import UUID
                             await self.db.update_worktree(
                                 worktree_id=epic_id,
                                 status='stale'
@@ -227,8 +429,7 @@ class WorktreeManager:
                             errors.append(f"Failed to mark worktree {epic_id} as stale: {e}")
 
             # 2. Check for git worktrees not in database
-            worktree_dir_path = self.project_path / self.worktree_dir
-            worktree_dir_str = str(worktree_dir_path).replace('\\', '/')
+            worktree_dir_str = str(self._worktree_root).replace('\\', '/')
 
             for worktree_path, branch in git_worktrees.items():
                 # Normalize path for comparison (Windows compatibility)
@@ -255,6 +456,7 @@ class WorktreeManager:
                                     created_at=datetime.now()
                                 )
                                 self._worktrees[epic_id] = worktree_info
+                                self._invalidate_status_cache()
                                 recovered_count += 1
                     except (ValueError, IndexError) as e:
                         logger.debug(f"Could not parse epic_id from path {worktree_path}: {e}")
@@ -276,10 +478,43 @@ class WorktreeManager:
                 'errors': errors
             }
 
+    async def refresh(self) -> None:
+        """
+        Re-read repository state cached by the manager.
+
+        Call after branches were created or deleted outside the manager
+        (e.g. by hand or by another process).
+        """
+        self.invalidate_main_branch()
+        await self._load_known_branches()
+
+    async def _load_known_branches(self) -> None:
+        """Load all local branch names with a single for-each-ref call."""
+        try:
+            output = await self._run_git(
+                ['for-each-ref', '--format=%(refname:short)', 'refs/heads/'],
+                timeout=10
+            )
+        except GitCommandError as e:
+            logger.debug(f"Could not list branches: {e}")
+            self._known_branches = None
+            return
+        self._known_branches = set(output.splitlines())
+        logger.debug(f"Loaded {len(self._known_branches)} local branches")
+
+    def _forget_branch(self, branch: str) -> None:
+        """Drop a deleted branch from the known-branch set."""
+        if self._known_branches is not None:
+            self._known_branches.discard(branch)
+
     def get_worktree_status(self) -> Dict[str, Any]:
         """
         Get current worktree status.
 
+        The result is built once and reused until a worktree is added,
+        removed or changes status, so frequent polling is cheap. Treat it
+        as read-only.
+
         Returns:
             Dict with worktree status information including:
             - total_worktrees: Total number of worktrees
@@ -287,10 +522,13 @@ class WorktreeManager:
             - merged_worktrees: Number of merged worktrees
             - worktrees: List of worktree info dicts
         """
+        if self._status_cache is not None:
+            return self._status_cache
+
         active_count = sum(1 for wt in self._worktrees.values() if wt.status == 'active')
         merged_count = sum(1 for wt in self._worktrees.values() if wt.status == 'merged')
 
-        return {
+        self._status_cache = {
             'total_worktrees': len(self._worktrees),
             'active_worktrees': active_count,
             'merged_worktrees': merged_count,
@@ -306,6 +544,11 @@ class WorktreeManager:
                 for wt in self._worktrees.values()
             ]
         }
+        return self._status_cache
+
+    def _invalidate_status_cache(self) -> None:
+        """Drop the cached get_worktree_status() result."""
+        self._status_cache = None
 
     def list_worktrees(self) -> List[WorktreeInfo]:
         """
@@ -316,13 +559,27 @@ class WorktreeManager:
         """
         return list(self._worktrees.values())
 
-    async def create_worktree(self, epic_id: int, epic_name: str) -> WorktreeInfo:
+    async def create_worktree(
+        self,
+        epic_id: int,
+        epic_name: str,
+        no_checkout: bool = False,
+        init_submodules: bool = True
+    ) -> WorktreeInfo:
         """
         Create a new worktree for an epic.
 
+        Worktrees share the main repository's object store, so creation only
+        writes the checkout itself.
+
         Args:
             epic_id: Epic ID
             epic_name: Epic name (used for branch naming)
+            no_checkout: Create the worktree without checking out files. The
+                caller must populate it (e.g. 'git checkout' or a sparse
+                checkout) before use; until then git sees every file as deleted.
+            init_submodules: Initialize submodules if the project has any,
+                borrowing objects from the main checkout's submodules
 
         Returns:
             WorktreeInfo for created worktree
@@ -338,18 +595,17 @@ class WorktreeManager:
             logger.info(f"Worktree already exists for epic {epic_id}: {existing.path}")
 
             # Check if the worktree directory still exists and is valid
-            worktree_path = Path(existing.path)
-            if worktree_path.exists() and worktree_path.is_dir():
+            worktree_path = existing.fs_path
+            if _is_dir(worktree_path):
                 # Verify it's a valid git worktree
-                try:
-                    await self._run_git(['status'], cwd=worktree_path, timeout=10)
+                if await self._is_live_worktree(worktree_path):
                     logger.info(f"Reusing existing worktree: {existing.path}")
                     return existing
-                except GitCommandError:
-                    logger.warning(f"Existing worktree is invalid, will recreate")
+                logger.warning(f"Existing worktree is invalid, will recreate")
 
             # Worktree is stale, remove from tracking
             del self._worktrees[epic_id]
+            self._invalidate_status_cache()
 
         # Create sanitized branch name
         branch_name = f"epic-{epic_id}-{self._sanitize_branch_name(epic_name)}"
@@ -359,40 +615,47 @@ class WorktreeManager:
         main_branch = await self._get_main_branch()
 
         # Create worktree path
-        worktree_path = self.project_path / self.worktree_dir / f"epic-{epic_id}"
+        worktree_path = self._worktree_root / f"epic-{epic_id}"
         worktree_path_str = str(worktree_path)
 
         try:
-            # Check if branch already exists
-            try:
-                await self._run_git(['rev-parse', '--verify', branch_name], timeout=10)
-                branch_exists = True
-                logger.info(f"Branch {branch_name} already exists")
-            except GitCommandError:
-                branch_exists = False
-                logger.info(f"Branch {branch_name} does not exist, will create")
-
-            # Create branch from main if it doesn't exist
-            if not branch_exists:
-                await self._run_git(
-                    ['branch', branch_name, main_branch],
-                    timeout=30
-                )
-                logger.info(f"Created branch {branch_name} from {main_branch}")
-
             # Create worktree directory if it exists (cleanup old worktree)
             if worktree_path.exists():
                 logger.warning(f"Worktree directory already exists, removing: {worktree_path}")
-                import shutil
-                shutil.rmtree(worktree_path, ignore_errors=True)
-
-            # Create worktree
-            await self._run_git(
-                ['worktree', 'add', worktree_path_str, branch_name],
-                timeout=60
+                await self._remove_worktree_dir(worktree_path)
+
+            # Create branch and worktree in one call. -B would also work but
+            # resets an existing branch, losing its commits, so an existing
+            # branch is instead attached with a plain 'worktree add'. The
+            # 'already exists' error covers branches made since the last load.
+            branch_exists = (
+                self._known_branches is not None and branch_name in self._known_branches
             )
+            add_args = ['worktree', 'add'] + (['--no-checkout'] if no_checkout else [])
+            if not branch_exists:
+                try:
+                    await self._run_git(
+                        add_args + ['-b', branch_name, worktree_path_str, main_branch],
+                        timeout=60
+                    )
+                    logger.info(f"Created branch {branch_name} from {main_branch}")
+                except GitCommandError as e:
+                    if b'a branch named' not in e.stderr:
+                        raise
+                    branch_exists = True
+            if branch_exists:
+                logger.info(f"Branch {branch_name} already exists")
+                await self._run_git(
+                    add_args + [worktree_path_str, branch_name],
+                    timeout=60
+                )
+            if self._known_branches is not None:
+                self._known_branches.add(branch_name)
             logger.info(f"Created worktree at {worktree_path}")
 
+            if init_submodules and not no_checkout:
+                await self._init_submodules(worktree_path)
+
             # Create WorktreeInfo
             worktree_info = WorktreeInfo(
                 path=worktree_path_str,
@@ -402,13 +665,15 @@ class WorktreeManager:
                 created_at=datetime.now()
             )
 
-            # Store in memory
+            # Store in memory; a fresh checkout has nothing to commit
             self._worktrees[epic_id] = worktree_info
+            self._invalidate_status_cache()
+            if not no_checkout:
+                self._mark_clean(epic_id)
 
             # Record in database if available
             if self.db:
                 try:
-                    from uuid import UUID
                     await self.db.create_worktree(
                         project_id=UUID(self.project_id),
                         epic_id=epic_id,
@@ -428,8 +693,7 @@ class WorktreeManager:
             # Cleanup on failure
             if worktree_path.exists():
                 try:
-                    import shutil
-                    shutil.rmtree(worktree_path, ignore_errors=True)
+                    await self._remove_worktree_dir(worktree_path)
                 except Exception:
                     pass
             raise
@@ -456,13 +720,25 @@ class WorktreeManager:
             raise GitCommandError(f"No worktree found for epic {epic_id}")
 
         worktree_info = self._worktrees[epic_id]
-        worktree_path = Path(worktree_info.path)
+        worktree_path = worktree_info.fs_path
 
         if not worktree_path.exists():
             raise GitCommandError(f"Worktree directory does not exist: {worktree_path}")
 
-        # Check for uncommitted changes in worktree
-        has_changes = await self._has_uncommitted_changes(cwd=worktree_path)
+        # Check for uncommitted changes in worktree. The same status call
+        # reports which branch the worktree has checked out.
+        if self._is_known_clean(epic_id):
+            has_changes = False
+        else:
+            worktree_status = await self._get_porcelain_status(cwd=worktree_path)
+            has_changes = worktree_status.has_changes
+            if worktree_status.head not in (None, worktree_info.branch):
+                logger.warning(
+                    f"Worktree for epic {epic_id} has {worktree_status.head} checked out, "
+                    f"expected {worktree_info.branch}"
+                )
+            if not has_changes:
+                self._mark_clean(epic_id)
         if has_changes:
             logger.info(f"Committing uncommitted changes in worktree")
             try:
@@ -477,6 +753,7 @@ class WorktreeManager:
                     timeout=30
                 )
                 logger.info(f"Committed changes in worktree")
+                self._mark_clean(epic_id)
             except GitCommandError as e:
                 logger.warning(f"Failed to commit changes: {e}")
                 # Continue anyway - might be okay
@@ -502,52 +779,50 @@ class WorktreeManager:
                 else:
                     raise
 
-        # Check for merge conflicts using dry run
-        logger.info(f"Checking for potential merge conflicts")
-        try:
-            # Use merge-tree for dry-run conflict detection (Git 2.38+)
-            # Fallback: just attempt the merge
-            merge_base_output = await self._run_git(
-                ['merge-base', main_branch, worktree_info.branch],
-                timeout=10
-            )
-            merge_base = merge_base_output.strip()
+        # Count commits unique to each side; None if it could not be determined
+        divergence = await self._count_divergence('HEAD', worktree_info.branch)
+        head_only, branch_only = divergence if divergence else (None, None)
 
+        # Check for merge conflicts using dry run (cached per commit pair).
+        # Only diverged histories can conflict.
+        if divergence is None or (head_only > 0 and branch_only > 0):
+            logger.info(f"Checking for potential merge conflicts")
             try:
-                # Try merge-tree (newer git versions)
-                conflicts = await self._run_git(
-                    ['merge-tree', merge_base, main_branch, worktree_info.branch],
-                    timeout=30
-                )
-
-                # Check if output indicates conflicts (contains conflict markers)
-                if '<<<<<<< ' in conflicts:
+                if await self._check_merge_conflicts(worktree_info.branch):
                     logger.warning(f"Merge would have conflicts")
                     # Continue anyway - will handle during actual merge
-                else:
-                    logger.info(f"No conflicts detected in dry run")
-            except GitCommandError:
-                # merge-tree not available or failed, continue with actual merge
-                logger.debug(f"merge-tree not available, will attempt merge")
-
-        except GitCommandError as e:
-            logger.warning(f"Could not check for conflicts: {e}")
+            except GitCommandError as e:
+                logger.warning(f"Could not check for conflicts: {e}")
 
         # Perform the merge
         try:
-            if squash:
-                logger.info(f"Performing squash merge of {worktree_info.branch}")
+            if branch_only == 0:
+                logger.info(f"{worktree_info.branch} has no new commits, nothing to merge")
+            elif head_only == 0 and not squash:
+                logger.info(f"Fast-forwarding to {worktree_info.branch}")
                 await self._run_git(
-                    ['merge', '--squash', worktree_info.branch],
+                    ['merge', '--ff-only', worktree_info.branch],
                     timeout=60
                 )
+                logger.info(f"Fast-forward merge completed")
+            elif squash:
+                logger.info(f"Performing squash merge of {worktree_info.branch}")
 
                 # Squash merge requires manual commit
                 commit_msg = f"Merge epic {epic_id}: {worktree_info.branch}"
-                await self._run_git(
-                    ['commit', '-m', commit_msg],
-                    timeout=30
-                )
+                squash_args = ['merge', '--squash', worktree_info.branch]
+                commit_args = ['commit', '-m', commit_msg]
+
+                if os.name == 'nt':
+                    await self._run_git(squash_args, timeout=60)
+                    await self._run_git(commit_args, timeout=30)
+                else:
+                    # One shell invocation for both steps
+                    await self._run_git_script(
+                        f"{self._git_shell_command(squash_args)} && "
+                        f"{self._git_shell_command(commit_args)}",
+                        timeout=90
+                    )
                 logger.info(f"Squash merge committed")
             else:
                 logger.info(f"Performing regular merge of {worktree_info.branch}")
@@ -560,7 +835,7 @@ class WorktreeManager:
 
         except GitCommandError as e:
             # Check if it's a merge conflict
-            if 'CONFLICT' in str(e) or 'conflict' in str(e).lower():
+            if e.is_conflict:
                 logger.error(f"Merge conflict detected")
 
                 # Abort the merge
@@ -572,17 +847,10 @@ class WorktreeManager:
 
                 # Update worktree status
                 worktree_info.status = 'conflict'
+                self._invalidate_status_cache()
 
                 # Update database if available
-                if self.db:
-                    try:
-                        from uuid import UUID
-                        await self.db.update_worktree(
-                            worktree_id=epic_id,  # Note: This assumes worktree_id = epic_id
-                            status='conflict'
-                        )
-                    except Exception as db_error:
-                        logger.warning(f"Failed to update database: {db_error}")
+                self._schedule_db_update(epic_id, status='conflict')
 
                 raise WorktreeConflictError(
                     f"Merge conflict for epic {epic_id}. Please resolve manually."
@@ -597,25 +865,16 @@ class WorktreeManager:
             ['rev-parse', 'HEAD'],
             timeout=10
         )
-        merge_commit = merge_commit.strip()
         logger.info(f"Merge commit: {merge_commit}")
 
         # Update worktree info
         worktree_info.status = 'merged'
         worktree_info.merged_at = datetime.now()
+        worktree_info.merged = True
+        self._invalidate_status_cache()
 
         # Update database if available
-        if self.db:
-            try:
-                from uuid import UUID
-                await self.db.update_worktree(
-                    worktree_id=epic_id,  # Note: This assumes worktree_id = epic_id
-                    status='merged',
-                    merge_commit=merge_commit
-                )
-                logger.info(f"Database updated with merge status")
-            except Exception as e:
-                logger.warning(f"Failed to update database: {e}")
+        self._schedule_db_update(epic_id, status='merged', merge_commit=merge_commit)
 
         logger.info(f"Worktree merge complete: {merge_commit}")
         return merge_commit
@@ -660,7 +919,7 @@ class WorktreeManager:
             raise GitCommandError(f"No worktree found for epic {epic_id}")
 
         worktree_info = self._worktrees[epic_id]
-        worktree_path = Path(worktree_info.path)
+        worktree_path = worktree_info.fs_path
         branch_name = worktree_info.branch
 
         if not worktree_path.exists():
@@ -685,7 +944,7 @@ class WorktreeManager:
             logger.info(f"Syncing changes into worktree branch {branch_name}")
 
             # Check for uncommitted changes in worktree
-            has_changes = await self._has_uncommitted_changes(cwd=worktree_path)
+            has_changes = await self._has_uncommitted_changes(cwd=worktree_path, epic_id=epic_id)
             if has_changes:
                 logger.warning(f"Worktree has uncommitted changes, committing before sync")
                 try:
@@ -698,9 +957,20 @@ class WorktreeManager:
                         timeout=30
                     )
                     logger.info(f"Committed uncommitted changes")
+                    self._mark_clean(epic_id)
                 except GitCommandError as e:
                     logger.warning(f"Failed to commit changes: {e}")
 
+            # Nothing to sync if the branch already contains every main commit
+            divergence = await self._count_divergence(main_branch, 'HEAD', cwd=worktree_path)
+            if divergence is not None and divergence[0] == 0:
+                logger.info(f"{branch_name} is already up to date with {main_branch}")
+                return {
+                    'status': 'success',
+                    'strategy': strategy,
+                    'message': f'Already up to date with {main_branch}'
+                }
+
             # Perform sync based on strategy
             if strategy == 'merge':
                 logger.info(f"Merging {main_branch} into {branch_name}")
@@ -712,6 +982,7 @@ class WorktreeManager:
                         timeout=60
                     )
                     logger.info(f"Merge successful")
+                    self._invalidate_conflict_cache(branch_name)
 
                     return {
                         'status': 'success',
@@ -721,22 +992,12 @@ class WorktreeManager:
 
                 except GitCommandError as e:
                     # Check if it's a merge conflict
-                    if 'CONFLICT' in str(e) or 'conflict' in str(e).lower():
+                    if e.is_conflict:
                         logger.warning(f"Merge conflict during sync")
 
                         # Get list of conflicted files
                         try:
-                            status_output = await self._run_git(
-                                ['status', '--short'],
-                                cwd=worktree_path,
-                                timeout=10
-                            )
-                            conflicted_files = []
-                            for line in status_output.split('\n'):
-                                if line.startswith('UU ') or line.startswith('AA ') or line.startswith('DD '):
-                                    file_path = line[3:].strip()
-                                    conflicted_files.append(file_path)
-
+                            conflicted_files = await self._get_conflicted_files(cwd=worktree_path)
                             logger.info(f"Found {len(conflicted_files)} conflicted files")
 
                             return {
@@ -768,6 +1029,7 @@ class WorktreeManager:
                         timeout=120
                     )
                     logger.info(f"Rebase successful")
+                    self._invalidate_conflict_cache(branch_name)
 
                     return {
                         'status': 'success',
@@ -777,22 +1039,12 @@ class WorktreeManager:
 
                 except GitCommandError as e:
                     # Check if it's a rebase conflict
-                    if 'CONFLICT' in str(e) or 'conflict' in str(e).lower():
+                    if e.is_conflict:
                         logger.warning(f"Rebase conflict during sync")
 
                         # Get list of conflicted files
                         try:
-                            status_output = await self._run_git(
-                                ['status', '--short'],
-                                cwd=worktree_path,
-                                timeout=10
-                            )
-                            conflicted_files = []
-                            for line in status_output.split('\n'):
-                                if line.startswith('UU ') or line.startswith('AA ') or line.startswith('DD '):
-                                    file_path = line[3:].strip()
-                                    conflicted_files.append(file_path)
-
+                            conflicted_files = await self._get_conflicted_files(cwd=worktree_path)
                             logger.info(f"Found {len(conflicted_files)} conflicted files")
 
                             # Abort the rebase to leave in clean state
@@ -861,7 +1113,7 @@ class WorktreeManager:
             return
 
         worktree_info = self._worktrees[epic_id]
-        worktree_path = Path(worktree_info.path)
+        worktree_path = worktree_info.fs_path
         branch_name = worktree_info.branch
 
         # Remove worktree using git worktree remove
@@ -895,252 +1147,1302 @@ class WorktreeManager:
             if worktree_path.exists():
                 logger.info(f"Attempting manual directory cleanup")
                 try:
-                    import shutil
-                    shutil.rmtree(worktree_path, ignore_errors=True)
+                    await asyncio.to_thread(shutil.rmtree, worktree_path, ignore_errors=True)
                     logger.info(f"Worktree directory removed manually")
                 except Exception as cleanup_error:
                     logger.error(f"Failed to remove worktree directory: {cleanup_error}")
 
-        # Delete branch if fully merged
-        try:
-            # Check if branch exists
+        # Delete branch if fully merged. No existence probe first: a missing
+        # branch just makes 'branch -d' exit 1, same as an unmerged one.
+        if self._known_branches is not None and branch_name not in self._known_branches:
+            worktree_info.branch_deleted = True
+        if worktree_info.branch_deleted:
+            logger.info(f"Branch {branch_name} already deleted")
+        else:
             try:
-                await self._run_git(['rev-parse', '--verify', branch_name], timeout=10)
-                branch_exists = True
-            except GitCommandError:
-                branch_exists = False
-                logger.info(f"Branch {branch_name} already deleted")
-
-            if branch_exists:
-                # Check if branch is fully merged into current branch
-                try:
-                    # Try to delete with -d (safe delete - only if merged)
-                    # This will fail if branch has unmerged changes
-                    await self._run_git(['branch', '-d', branch_name], timeout=30)
-                    logger.info(f"Branch deleted successfully (was fully merged)")
-                except GitCommandError as e:
+                # Try to delete with -d (safe delete - only if merged)
+                # This will fail if branch has unmerged changes
+                await self._run_git(['branch', '-d', branch_name], timeout=30)
+                worktree_info.branch_deleted = True
+                self._forget_branch(branch_name)
+                logger.info(f"Branch deleted successfully (was fully merged)")
+            except GitCommandError as e:
+                if e.returncode == 1 and b'not found' in e.stderr:
+                    worktree_info.branch_deleted = True
+                    self._forget_branch(branch_name)
+                    logger.info(f"Branch {branch_name} already deleted")
+                elif e.returncode == 1:
                     # Branch has unmerged changes
-                    if 'not fully merged' in str(e):
-                        logger.warning(f"Branch {branch_name} has unmerged changes")
-                        logger.info(f"Use 'git branch -D {branch_name}' to force delete if needed")
-                        # Don't force delete - let user decide
-                    else:
-                        # Other error
-                        logger.warning(f"Could not delete branch: {e}")
-
-
-        except Exception as e:
-            logger.error(f"Error during branch cleanup: {e}")
+                    logger.warning(f"Branch {branch_name} has unmerged changes")
+                    logger.info(f"Use 'git branch -D {branch_name}' to force delete if needed")
+                    # Don't force delete - let user decide
+                else:
+                    # Other error
+                    logger.warning(f"Could not delete branch: {e}")
 
         # Update database to mark as cleaned up
-        if self.db:
-            try:
-                from uuid import UUID
-                await self.db.update_worktree(
-                    worktree_id=epic_id,  # Note: This assumes worktree_id = epic_id
-                    status='cleanup'
-                )
-                logger.info(f"Database updated with cleanup status")
-            except Exception as e:
-                logger.warning(f"Failed to update database: {e}")
+        self._schedule_db_update(epic_id, status='cleanup')
 
         # Remove from memory
         del self._worktrees[epic_id]
+        self._invalidate_status_cache()
+        self._dirty.pop(epic_id, None)
+        self._clean_checked_at.pop(epic_id, None)
         logger.info(f"Worktree cleanup complete for epic {epic_id}")
 
-    async def _run_git(
-        self,
-        args: List[str],
-        cwd: Optional[Path] = None,
-        timeout: int = 60
-    ) -> str:
+    async def cleanup_worktrees(self, epic_ids: List[int]) -> None:
         """
-        Run a git command asynchronously.
-
-        Args:
-            args: Git command arguments (e.g., ['status', '--short'])
-            cwd: Working directory for command (defaults to project_path)
-            timeout: Command timeout in seconds (default 60)
+        Remove several worktrees and their branches in one sweep.
 
-        Returns:
-            Command stdout output
+        Equivalent to calling cleanup_worktree() for each epic, but all
+        'git worktree remove' calls run in a single shell invocation and the
+        branches are deleted in bulk: branches this manager merged go through
+        one 'git update-ref --stdin' transaction, the rest through one
+        'git branch -d' call (which keeps unmerged ones).
 
-        Raises:
-            GitCommandError: If command fails or times out
+        Args:
+            epic_ids: Epic IDs whose worktrees should be cleaned up
         """
-        if cwd is None:
-            cwd = self.project_path
+        logger.info(f"Cleaning up worktrees for epics {epic_ids}")
 
-        cmd = ['git'] + args
-        logger.debug(f"Running git command: {' '.join(cmd)} in {cwd}")
+        worktree_infos = []
+        for epic_id in epic_ids:
+            if epic_id in self._worktrees:
+                worktree_infos.append(self._worktrees[epic_id])
+            else:
+                logger.warning(f"No worktree found for epic {epic_id}, nothing to clean up")
 
-        try:
-            process = await asyncio.create_subprocess_exec(
-                *cmd,
-                cwd=str(cwd),
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
+        if not worktree_infos:
+            return
 
+        # Remove worktrees (retrying each with --force if the plain remove fails)
+        existing_paths = [wt.path for wt in worktree_infos if wt.fs_path.exists()]
+        if existing_paths:
             try:
-                stdout, stderr = await asyncio.wait_for(
-                    process.communicate(),
-                    timeout=timeout
-                )
-            except asyncio.TimeoutError:
-                process.kill()
-                await process.wait()
-                raise GitCommandError(
-                    f"Git command timed out after {timeout}s: {' '.join(cmd)}"
-                )
-
-            if process.returncode != 0:
-                stderr_str = stderr.decode('utf-8', errors='replace').strip()
-                raise GitCommandError(
-                    f"Git command failed (exit {process.returncode}): {' '.join(cmd)}\n{stderr_str}"
-                )
+                if os.name == 'nt':
+                    # cmd.exe has no POSIX quoting, so remove one by one
+                    for path in existing_paths:
+                        try:
+                            await self._run_git(['worktree', 'remove', path], timeout=30)
+                        except GitCommandError:
+                            await self._run_git(['worktree', 'remove', '--force', path], timeout=30)
+                else:
+                    script = '; '.join(
+                        f"{self._git_shell_command(['worktree', 'remove', path])} || "
+                        f"{self._git_shell_command(['worktree', 'remove', '--force', path])}"
+                        for path in existing_paths
+                    )
+                    await self._run_git_script(script, timeout=30 * len(existing_paths))
+                logger.info(f"Removed {len(existing_paths)} worktrees")
+            except GitCommandError as e:
+                logger.warning(f"Git worktree remove failed: {e}")
+
+            # Anything git could not remove is deleted manually
+            for path in existing_paths:
+                if Path(path).exists():
+                    logger.info(f"Attempting manual directory cleanup: {path}")
+                    await asyncio.to_thread(shutil.rmtree, path, ignore_errors=True)
+
+        pending = [
+            wt for wt in worktree_infos
+            if not wt.branch_deleted
+            and (self._known_branches is None or wt.branch in self._known_branches)
+        ]
+
+        # Branches merged by this manager need no merge check; delete them
+        # all in one ref transaction
+        merged = [wt for wt in pending if wt.merged]
+        if merged:
+            try:
+                await self._delete_branch_refs([wt.branch for wt in merged])
+                for wt in merged:
+                    wt.branch_deleted = True
+                    self._forget_branch(wt.branch)
+                pending = [wt for wt in pending if not wt.merged]
+                logger.info(f"Deleted {len(merged)} merged branches")
+            except GitCommandError as e:
+                logger.warning(f"Bulk branch delete failed, falling back to 'git branch -d': {e}")
 
-            return stdout.decode('utf-8', errors='replace').strip()
+        # Delete the remaining fully merged branches at once; git skips the rest
+        branch_names = [wt.branch for wt in pending]
+        if branch_names:
+            try:
+                await self._run_git(['branch', '-d'] + branch_names, timeout=30)
+                for branch in branch_names:
+                    self._forget_branch(branch)
+                logger.info(f"Deleted {len(branch_names)} branches (all fully merged)")
+            except GitCommandError as e:
+                # Merged branches were still deleted; report the ones git kept
+                # and re-read which branches remain
+                logger.warning(f"Some branches were not deleted: {e}")
+                if self._known_branches is not None:
+                    await self._load_known_branches()
 
-        except FileNotFoundError:
-            raise GitCommandError("Git command not found. Is git installed?")
-        except Exception as e:
-            if isinstance(e, GitCommandError):
-                raise
-            raise GitCommandError(f"Failed to run git command: {e}")
+        # Update database to mark as cleaned up
+        for wt in worktree_infos:
+            self._schedule_db_update(wt.epic_id, status='cleanup')
 
-    async def _get_main_branch(self) -> str:
+        # Remove from memory
+        for wt in worktree_infos:
+            del self._worktrees[wt.epic_id]
+            self._dirty.pop(wt.epic_id, None)
+            self._clean_checked_at.pop(wt.epic_id, None)
+        self._invalidate_status_cache()
+        logger.info(f"Worktree cleanup complete for {len(worktree_infos)} epics")
+
+    async def _init_submodules(self, worktree_path: Path) -> None:
         """
-        Detect the main branch name (main or master).
+        Initialize a new worktree's submodules from local objects.
 
-        Returns:
-            Name of main branch ('main' or 'master')
+        Each submodule already checked out in the main repository is passed
+        as '--reference', so its objects are borrowed instead of fetched
+        again. Failures are logged; the worktree itself stays usable.
 
-        Raises:
-            GitCommandError: If unable to determine main branch
+        Args:
+            worktree_path: Freshly created worktree
         """
+        if not (worktree_path / '.gitmodules').is_file():
+            return
+
         try:
-            # Try to get default branch from remote
             output = await self._run_git(
-                ['symbolic-ref', 'refs/remotes/origin/HEAD'],
+                ['config', '-f', '.gitmodules', '--get-regexp', r'^submodule\..*\.path$'],
+                cwd=worktree_path,
                 timeout=10
             )
-            # Output format: refs/remotes/origin/main
-            branch = output.split('/')[-1]
-            logger.debug(f"Detected main branch from remote: {branch}")
-            return branch
-        except GitCommandError:
-            # Fallback: check if main or master exists locally
+        except GitCommandError as e:
+            logger.warning(f"Could not read .gitmodules: {e}")
+            return
+
+        submodule_paths = [line.split(' ', 1)[1] for line in output.splitlines() if ' ' in line]
+        without_reference = []
+        for submodule_path in submodule_paths:
+            reference = self.project_path / submodule_path
+            if not (reference / '.git').exists():
+                without_reference.append(submodule_path)
+                continue
             try:
-                await self._run_git(['rev-parse', '--verify', 'main'], timeout=10)
-                logger.debug("Using 'main' as main branch")
-                return 'main'
-            except GitCommandError:
-                try:
-                    await self._run_git(['rev-parse', '--verify', 'master'], timeout=10)
-                    logger.debug("Using 'master' as main branch")
-                    return 'master'
-                except GitCommandError:
-                    raise GitCommandError(
-                        "Could not determine main branch (neither 'main' nor 'master' found)"
-                    )
+                await self._run_git(
+                    ['submodule', 'update', '--init', '--reference', str(reference),
+                     '--', submodule_path],
+                    cwd=worktree_path,
+                    timeout=300
+                )
+            except GitCommandError as e:
+                logger.warning(f"Could not initialize submodule {submodule_path}: {e}")
+
+        if without_reference:
+            try:
+                await self._run_git(
+                    ['submodule', 'update', '--init', '--'] + without_reference,
+                    cwd=worktree_path,
+                    timeout=300
+                )
+            except GitCommandError as e:
+                logger.warning(f"Could not initialize submodules: {e}")
+
+        logger.info(f"Initialized {len(submodule_paths)} submodules in {worktree_path}")
 
-    async def _get_current_branch(self, cwd: Optional[Path] = None) -> str:
+    async def _delete_branch_refs(self, branches: List[str]) -> None:
         """
-        Get the current branch name.
+        Delete local branches in a single 'git update-ref --stdin' transaction.
 
-        Args:
-            cwd: Working directory (defaults to project_path)
+        Unlike 'git branch -d' this does not check that the branches are
+        merged, so only pass branches known to be merged. Each ref is deleted
+        only if it still points at the commit read just before, and either
+        every branch is deleted or none is.
 
-        Returns:
-            Current branch name
+        Args:
+            branches: Branch names (without refs/heads/)
 
         Raises:
-            GitCommandError: If not on a branch or command fails
+            GitCommandError: If the refs cannot be read or the transaction fails
         """
+        refs = {f'refs/heads/{branch}' for branch in branches}
         output = await self._run_git(
-            ['rev-parse', '--abbrev-ref', 'HEAD'],
-            cwd=cwd,
+            ['for-each-ref', '--format=%(objectname) %(refname)'] + sorted(refs),
             timeout=10
         )
 
-        if output == 'HEAD':
-            raise GitCommandError("Not currently on a branch (detached HEAD)")
+        commands = []
+        for line in output.splitlines():
+            sha, _, ref = line.partition(' ')
+            if ref in refs:
+                commands.append(f'delete {ref} {sha}\n')
+        if not commands:
+            return
 
-        logger.debug(f"Current branch: {output}")
-        return output
+        await self._run_git(
+            ['update-ref', '--stdin'],
+            timeout=30,
+            input=''.join(commands).encode('utf-8')
+        )
 
-    async def _has_uncommitted_changes(self, cwd: Optional[Path] = None) -> bool:
+    async def _remove_worktree_dir(self, worktree_path: Path) -> None:
         """
-        Check if working directory has uncommitted changes.
+        Remove a worktree directory without blocking the event loop.
 
-        Args:
-            cwd: Working directory (defaults to project_path)
+        Tries 'git worktree remove --force' first, which also unregisters the
+        worktree. Whatever git leaves behind (e.g. a directory git does not
+        know about) is deleted with shutil.rmtree in a worker thread.
 
-        Returns:
-            True if there are uncommitted changes, False otherwise
+        Args:
+            worktree_path: Worktree directory to remove
         """
-        output = await self._run_git(
-            ['status', '--short'],
-            cwd=cwd,
-            timeout=10
-        )
-
-        has_changes = len(output) > 0
-        logger.debug(f"Uncommitted changes: {has_changes}")
-        return has_changes
+        try:
+            await self._run_git(
+                ['worktree', 'remove', '--force', str(worktree_path)],
+                timeout=30
+            )
+        except GitCommandError as e:
+            logger.debug(f"git worktree remove failed, deleting manually: {e}")
 
-    async def _check_merge_conflicts(self, branch: str) -> bool:
-        """
-        Check if merging a branch would cause conflicts using git merge-tree dry run.
+        if worktree_path.exists():
+            await asyncio.to_thread(shutil.rmtree, worktree_path, ignore_errors=True)
+
+    async def _run_git(
+        self,
+        args: List[str],
+        cwd: Optional[StrPath] = None,
+        timeout: int = 60,
+        input: Optional[bytes] = None
+    ) -> str:
+        """
+        Run a git command asynchronously.
 
         Args:
-            branch: Branch name to check for conflicts
+            args: Git command arguments (e.g., ['status', '--short'])
+            cwd: Working directory for command (defaults to project_path)
+            timeout: Command timeout in seconds (default 60)
+            input: Data written to git's stdin (e.g. for --stdin commands)
 
         Returns:
-            True if conflicts would occur, False otherwise
+            Command stdout output, without the trailing newline
 
         Raises:
-            GitCommandError: If conflict check fails
+            GitCommandError: If command fails or times out
         """
-        logger.info(f"Checking for merge conflicts with branch {branch}")
+        stdout = await self._run_git_bytes(args, cwd=cwd, timeout=timeout, input=input)
+        # Trim the line terminator on the bytes so only the payload is decoded;
+        # leading whitespace is kept since it is significant in some formats
+        return stdout.rstrip(b'\r\n').decode('utf-8', errors='replace')
+
+    async def _run_git_bytes(
+        self,
+        args: List[str],
+        cwd: Optional[StrPath] = None,
+        timeout: int = 60,
+        input: Optional[bytes] = None
+    ) -> bytes:
+        """
+        Run a git command asynchronously and return its raw stdout.
+
+        Use this instead of _run_git when the output is scanned at the byte
+        level, to skip decoding and stripping the whole buffer.
+
+        Args:
+            args: Git command arguments (e.g., ['status', '--short'])
+            cwd: Working directory for command (defaults to project_path)
+            timeout: Command timeout in seconds (default 60)
+            input: Data written to git's stdin (e.g. for --stdin commands)
+
+        Returns:
+            Command stdout output as bytes
+
+        Raises:
+            GitCommandError: If command fails or times out
+        """
+        if cwd is None:
+            cwd = self._project_dir
+
+        cmd = self._git_cmd(args, cwd)
+        logger.debug(f"Running git command: {' '.join(cmd)} in {cwd}")
+
+        async with self._git_sem:
+            return await self._exec_git(cmd, timeout, input=input)
+
+    async def _run_git_check(
+        self,
+        args: List[str],
+        cwd: Optional[StrPath] = None,
+        timeout: int = 10
+    ) -> Optional[str]:
+        """
+        Run a git probe whose failure is an expected answer, not an error.
+
+        Unlike _run_git, a non-zero exit returns None instead of raising, and
+        stderr is discarded rather than captured. Use it for existence checks
+        (e.g. 'rev-parse --verify --quiet <ref>') that often miss.
+
+        Args:
+            args: Git command arguments
+            cwd: Working directory for command (defaults to project_path)
+            timeout: Command timeout in seconds (default 10)
+
+        Returns:
+            Command stdout output without the trailing newline, or None if
+            git exited non-zero
+
+        Raises:
+            GitCommandError: If git cannot be run or times out
+        """
+        cmd = self._git_cmd(args, cwd if cwd is not None else self._project_dir)
+        logger.debug(f"Running git check: {' '.join(cmd)}")
+
+        async with self._git_sem:
+            try:
+                process = await asyncio.create_subprocess_exec(
+                    *cmd,
+                    env=self._git_env,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.DEVNULL,
+                    **self._spawn_kwargs
+                )
+            except FileNotFoundError:
+                raise GitCommandError("Git command not found. Is git installed?")
+
+            try:
+                stdout, _ = await asyncio.wait_for(process.communicate(), timeout=timeout)
+            except asyncio.TimeoutError:
+                process.kill()
+                await process.wait()
+                raise GitCommandError(
+                    f"Git command timed out after {timeout}s: {' '.join(cmd)}"
+                )
+
+        if process.returncode != 0:
+            return None
+        return stdout.rstrip(b'\r\n').decode('utf-8', errors='replace')
+
+    def _git_cmd(self, args: List[str], cwd: StrPath) -> List[str]:
+        """
+        Build the full git command line for a set of arguments.
+
+        Runs in cwd via 'git -C', prepends GIT_CONFIG_ARGS, and adds
+        --no-optional-locks for status so read-only polling never takes
+        (or refreshes) the index lock.
+
+        Args:
+            args: Git command arguments
+            cwd: Directory git should run in
+
+        Returns:
+            Command line starting with the git executable
+        """
+        prefix = [self._git_executable, '-C', os.fspath(cwd)]
+        if args and args[0] == 'status':
+            prefix.append('--no-optional-locks')
+        return prefix + self.GIT_CONFIG_ARGS + args
+
+    def _git_shell_command(self, args: List[str], cwd: Optional[StrPath] = None) -> str:
+        """
+        Build a shell-quoted git command line for use in _run_git_script.
+
+        Args:
+            args: Git command arguments
+            cwd: Directory git should run in (defaults to project_path)
+
+        Returns:
+            Quoted command string
+        """
+        return shlex.join(self._git_cmd(args, cwd if cwd is not None else self._project_dir))
+
+    async def _run_git_script(self, script: str, timeout: int = 60) -> str:
+        """
+        Run several git commands in one POSIX shell invocation.
+
+        Build the script from _git_shell_command() pieces so every argument
+        is quoted and each command carries its own working directory.
+        Counts as a single process against the git concurrency cap.
+
+        Args:
+            script: Shell script (e.g., commands joined with '&&' or ';')
+            timeout: Timeout for the whole script in seconds (default 60)
+
+        Returns:
+            Combined stdout output
+
+        Raises:
+            GitCommandError: If the script exits non-zero or times out
+        """
+        logger.debug(f"Running git script: {script}")
+
+        async with self._git_sem:
+            stdout = await self._exec_git(script, timeout)
+        return stdout.rstrip(b'\r\n').decode('utf-8', errors='replace')
+
+    async def _exec_git(
+        self,
+        cmd: Union[List[str], str],
+        timeout: int,
+        input: Optional[bytes] = None
+    ) -> bytes:
+        """
+        Spawn a git process and collect its output (caller holds _git_sem).
+
+        Args:
+            cmd: Full command line from _git_cmd(), or a shell script string
+            timeout: Command timeout in seconds
+            input: Data written to the process's stdin, if any
+
+        Returns:
+            Command stdout output as bytes
+
+        Raises:
+            GitCommandError: If command fails or times out
+        """
+        stdin = asyncio.subprocess.PIPE if input is not None else None
+        if isinstance(cmd, str):
+            spawn = asyncio.create_subprocess_shell(
+                cmd,
+                env=self._git_env,
+                stdin=stdin,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                **self._spawn_kwargs
+            )
+            cmd = [cmd]
+        else:
+            spawn = asyncio.create_subprocess_exec(
+                *cmd,
+                env=self._git_env,
+                stdin=stdin,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                **self._spawn_kwargs
+            )
+
+        try:
+            process = await spawn
+
+            try:
+                stdout, stderr = await asyncio.wait_for(
+                    process.communicate(input),
+                    timeout=timeout
+                )
+            except asyncio.TimeoutError:
+                process.kill()
+                await process.wait()
+                raise GitCommandError(
+                    f"Git command timed out after {timeout}s: {' '.join(cmd)}"
+                )
+
+            if process.returncode != 0:
+                stderr_str = stderr.decode('utf-8', errors='replace').strip()
+                raise GitCommandError(
+                    f"Git command failed (exit {process.returncode}): {' '.join(cmd)}\n{stderr_str}",
+                    returncode=process.returncode,
+                    stdout=stdout,
+                    stderr=stderr
+                )
+
+            return stdout
+
+        except FileNotFoundError:
+            raise GitCommandError("Git command not found. Is git installed?")
+        except Exception as e:
+            if isinstance(e, GitCommandError):
+                raise
+            raise GitCommandError(f"Failed to run git command: {e}")
+
+    async def _run_git_stream_lines(
+        self,
+        args: List[str],
+        cwd: Optional[StrPath] = None,
+        timeout: int = 60
+    ) -> AsyncIterator[bytes]:
+        """
+        Run a git command asynchronously and yield its stdout line by line.
+
+        Lines are yielded as raw bytes without the trailing separator, so
+        callers can filter or short-circuit without buffering the whole
+        output. When '-z' is among the args, NUL is used as the separator.
+        If the caller stops iterating early, the git process is killed.
+
+        Args:
+            args: Git command arguments (e.g., ['status', '--short'])
+            cwd: Working directory for command (defaults to project_path)
+            timeout: Command timeout in seconds (default 60)
+
+        Yields:
+            Output lines as bytes
+
+        Raises:
+            GitCommandError: If command fails or times out
+        """
+        if cwd is None:
+            cwd = self._project_dir
+
+        cmd = self._git_cmd(args, cwd)
+        separator = b'\x00' if '-z' in args else b'\n'
+        logger.debug(f"Streaming git command: {' '.join(cmd)} in {cwd}")
+
+        # Hold a git slot for the lifetime of the process, not just the spawn
+        async with self._git_sem:
+            lines = self._exec_git_stream(cmd, timeout, separator)
+            try:
+                async for line in lines:
+                    yield line
+            finally:
+                await lines.aclose()
+
+    async def _exec_git_stream(
+        self,
+        cmd: List[str],
+        timeout: int,
+        separator: bytes
+    ) -> AsyncIterator[bytes]:
+        """
+        Spawn a git process and yield its stdout lines (caller holds _git_sem).
+
+        Args:
+            cmd: Full command line from _git_cmd()
+            timeout: Command timeout in seconds
+            separator: Line separator (b'\\n' or b'\\x00')
+
+        Yields:
+            Output lines as bytes
+
+        Raises:
+            GitCommandError: If command fails or times out
+        """
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *cmd,
+                env=self._git_env,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                **self._spawn_kwargs
+            )
+        except FileNotFoundError:
+            raise GitCommandError("Git command not found. Is git installed?")
+        except Exception as e:
+            raise GitCommandError(f"Failed to run git command: {e}")
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        finished = False
 
         try:
-            # Get main branch
-            main_branch = await self._get_main_branch()
+            while True:
+                try:
+                    line = await asyncio.wait_for(
+                        process.stdout.readuntil(separator),
+                        timeout=max(deadline - loop.time(), 0)
+                    )
+                except asyncio.IncompleteReadError as e:
+                    # EOF: yield any trailing unterminated line
+                    if e.partial:
+                        yield e.partial
+                    break
+                except asyncio.TimeoutError:
+                    raise GitCommandError(
+                        f"Git command timed out after {timeout}s: {' '.join(cmd)}"
+                    )
+                yield line[:-1]
+
+            stderr = await process.stderr.read()
+            await process.wait()
+            finished = True
+
+            if process.returncode != 0:
+                stderr_str = stderr.decode('utf-8', errors='replace').strip()
+                raise GitCommandError(
+                    f"Git command failed (exit {process.returncode}): {' '.join(cmd)}\n{stderr_str}",
+                    returncode=process.returncode,
+                    stderr=stderr
+                )
+        finally:
+            if not finished and process.returncode is None:
+                process.kill()
+                await process.wait()
+
+    def _git_common_dir(self) -> Optional[Path]:
+        """
+        Locate the directory holding the repository's refs.
 
-            # Get merge base
-            merge_base_output = await self._run_git(
-                ['merge-base', main_branch, branch],
+        Follows a '.git' file's 'gitdir:' pointer and a linked worktree's
+        'commondir' file, so it works when project_path is itself a worktree.
+
+        Returns:
+            Path to the common git directory, or None if not found
+        """
+        git_dir = self.project_path / '.git'
+        try:
+            if git_dir.is_file():
+                content = git_dir.read_text(encoding='utf-8').strip()
+                if not content.startswith('gitdir:'):
+                    return None
+                git_dir = self.project_path / content[len('gitdir:'):].strip()
+            elif not git_dir.is_dir():
+                return None
+
+            commondir_file = git_dir / 'commondir'
+            if commondir_file.is_file():
+                git_dir = git_dir / commondir_file.read_text(encoding='utf-8').strip()
+        except OSError:
+            return None
+
+        return git_dir
+
+    def _origin_head_mtime(self) -> Optional[int]:
+        """
+        Get the mtime of refs/remotes/origin/HEAD (None if absent).
+        """
+        git_dir = self._git_common_dir()
+        if git_dir is None:
+            return None
+        try:
+            return os.stat(git_dir / 'refs' / 'remotes' / 'origin' / 'HEAD').st_mtime_ns
+        except OSError:
+            return None
+
+    def _read_main_branch_from_disk(self) -> Optional[str]:
+        """
+        Detect the main branch by reading ref files instead of running git.
+
+        Checks refs/remotes/origin/HEAD, then whether 'main' or 'master'
+        exists as a loose ref or in packed-refs.
+
+        Returns:
+            Main branch name, or None if it can't be determined from disk
+        """
+        git_dir = self._git_common_dir()
+        if git_dir is None:
+            return None
+
+        try:
+            origin_head = (git_dir / 'refs' / 'remotes' / 'origin' / 'HEAD').read_text(encoding='utf-8')
+            # Format: ref: refs/remotes/origin/main
+            prefix = 'ref: refs/remotes/origin/'
+            if origin_head.startswith(prefix):
+                return origin_head[len(prefix):].strip()
+        except OSError:
+            pass
+
+        try:
+            packed_refs = (git_dir / 'packed-refs').read_text(encoding='utf-8').splitlines()
+        except OSError:
+            packed_refs = []
+
+        for candidate in ('main', 'master'):
+            ref = f'refs/heads/{candidate}'
+            if (git_dir / ref).is_file():
+                return candidate
+            if any(line.endswith(' ' + ref) for line in packed_refs):
+                return candidate
+
+        return None
+
+    async def _get_main_branch(self) -> str:
+        """
+        Get the main branch name, detecting it on first use.
+
+        The result is cached on the instance and only re-detected if
+        origin/HEAD changes on disk.
+
+        Returns:
+            Name of main branch ('main' or 'master')
+
+        Raises:
+            GitCommandError: If unable to determine main branch
+        """
+        origin_head_mtime = self._origin_head_mtime()
+        if self._main_branch is not None and origin_head_mtime == self._main_branch_mtime:
+            return self._main_branch
+
+        # Serialize detection so concurrent create_worktree calls probe once
+        async with self._main_branch_lock:
+            if self._main_branch is None or origin_head_mtime != self._main_branch_mtime:
+                self._main_branch = await self._detect_main_branch()
+                self._main_branch_mtime = origin_head_mtime
+            return self._main_branch
+
+    def invalidate_main_branch(self) -> None:
+        """
+        Forget the cached main branch so the next call re-detects it.
+        """
+        self._main_branch = None
+        self._main_branch_mtime = None
+
+    async def _detect_main_branch(self) -> str:
+        """
+        Detect the main branch name (main or master).
+
+        Returns:
+            Name of main branch ('main' or 'master')
+
+        Raises:
+            GitCommandError: If unable to determine main branch
+        """
+        # Plain file reads cover the common layouts without spawning git
+        branch = self._read_main_branch_from_disk()
+        if branch:
+            logger.debug(f"Detected main branch from ref files: {branch}")
+            return branch
+
+        try:
+            # Try to get default branch from remote
+            output = await self._run_git(
+                ['symbolic-ref', '--short', 'refs/remotes/origin/HEAD'],
                 timeout=10
             )
-            merge_base = merge_base_output.strip()
-            logger.debug(f"Merge base: {merge_base}")
+            # Output format: origin/main
+            _, _, branch = output.partition('/')
+            logger.debug(f"Detected main branch from remote: {branch}")
+            return branch
+        except GitCommandError:
+            # Fallback: check if main or master exists locally
+            for candidate in ('main', 'master'):
+                if await self._run_git_check(['rev-parse', '--verify', '--quiet', candidate]) is not None:
+                    logger.debug(f"Using '{candidate}' as main branch")
+                    return candidate
+            raise GitCommandError(
+                "Could not determine main branch (neither 'main' nor 'master' found)"
+            )
 
-            # Use merge-tree for dry-run conflict detection
-            # Format: git merge-tree <base-commit> <branch1> <branch2>
+    async def _get_current_branch(self, cwd: Optional[StrPath] = None) -> str:
+        """
+        Get the current branch name.
+
+        Args:
+            cwd: Working directory (defaults to project_path)
+
+        Returns:
+            Current branch name
+
+        Raises:
+            GitCommandError: If not on a branch or command fails
+        """
+        output = await self._run_git(
+            ['rev-parse', '--abbrev-ref', 'HEAD'],
+            cwd=cwd,
+            timeout=10
+        )
+
+        if output == 'HEAD':
+            raise GitCommandError("Not currently on a branch (detached HEAD)")
+
+        logger.debug(f"Current branch: {output}")
+        return output
+
+    async def _count_divergence(
+        self,
+        left: str,
+        right: str,
+        cwd: Optional[StrPath] = None
+    ) -> Optional[Tuple[int, int]]:
+        """
+        Count commits unique to each side of two refs in one git call.
+
+        Args:
+            left: First ref (e.g. 'HEAD' or the main branch)
+            right: Second ref
+            cwd: Working directory (default: project_path)
+
+        Returns:
+            (commits only on left, commits only on right), or None if the
+            counts could not be determined
+        """
+        try:
+            output = await self._run_git(
+                ['rev-list', '--left-right', '--count', f'{left}...{right}'],
+                cwd=cwd,
+                timeout=10
+            )
+        except GitCommandError as e:
+            logger.debug(f"Could not count divergence of {left}...{right}: {e}")
+            return None
+
+        counts = output.split()
+        if len(counts) != 2 or not all(count.isdigit() for count in counts):
+            return None
+        return int(counts[0]), int(counts[1])
+
+    async def _is_live_worktree(self, worktree_path: Path) -> bool:
+        """
+        Check whether a directory is a usable git working tree.
+
+        Uses 'rev-parse --is-inside-work-tree', which answers without
+        scanning the tree the way 'git status' does.
+
+        Args:
+            worktree_path: Worktree directory to check
+
+        Returns:
+            True if git can operate in the directory, False otherwise
+        """
+        output = await self._run_git_check(['rev-parse', '--is-inside-work-tree'], cwd=worktree_path)
+        return output is not None
+
+    def mark_dirty(self, epic_id: int) -> None:
+        """
+        Record that an epic's worktree may have been modified.
+
+        Call this before letting an agent work in the worktree so the next
+        merge/sync re-checks git status instead of trusting the clean state.
+
+        Args:
+            epic_id: Epic ID
+        """
+        self._dirty[epic_id] = True
+
+    def _mark_clean(self, epic_id: int) -> None:
+        """
+        Record that an epic's worktree was just verified to be clean.
+
+        Args:
+            epic_id: Epic ID
+        """
+        self._dirty[epic_id] = False
+        self._clean_checked_at[epic_id] = time.monotonic()
+
+    def _is_known_clean(self, epic_id: int) -> bool:
+        """
+        Check whether an epic's worktree can be assumed clean without git.
+
+        True when the caller opted in with track_changes, and the worktree
+        was verified clean within CLEAN_STATUS_TTL seconds and has not been
+        marked dirty since.
+
+        Args:
+            epic_id: Epic ID
+
+        Returns:
+            True if git status can be skipped
+        """
+        if not self.track_changes or self._dirty.get(epic_id) is not False:
+            return False
+        if time.monotonic() - self._clean_checked_at.get(epic_id, 0.0) >= self.CLEAN_STATUS_TTL:
+            return False
+        logger.debug(f"Worktree for epic {epic_id} known clean, skipping git status")
+        return True
+
+    async def _get_porcelain_status(self, cwd: Optional[StrPath] = None) -> GitStatus:
+        """
+        Read branch and change information with a single git status call.
+
+        Args:
+            cwd: Working directory (defaults to project_path)
+
+        Returns:
+            GitStatus for the working tree
+
+        Raises:
+            GitCommandError: If git status fails
+        """
+        output = await self._run_git_bytes(
+            ['status', '--porcelain=v2', '--branch', '-z'],
+            cwd=cwd,
+            timeout=10
+        )
+        return self._parse_porcelain_status(output)
+
+    @staticmethod
+    def _parse_porcelain_status(output: bytes) -> GitStatus:
+        """
+        Parse NUL-separated 'git status --porcelain=v2 --branch -z' output.
+
+        Args:
+            output: Raw git status output
+
+        Returns:
+            GitStatus with the header fields and changed paths
+        """
+        status = GitStatus()
+        records = output.decode('utf-8', errors='replace').split('\0')
+        # Number of space-separated fields before the path, per entry type
+        path_field = {'1': 8, '2': 9, 'u': 10, '?': 1, '!': 1}
+
+        i = 0
+        while i < len(records):
+            record = records[i]
+            i += 1
+            if not record:
+                continue
+
+            if record.startswith('# '):
+                key, _, value = record[2:].partition(' ')
+                if key == 'branch.oid' and value != '(initial)':
+                    status.oid = value
+                elif key == 'branch.head' and value != '(detached)':
+                    status.head = value
+                elif key == 'branch.upstream':
+                    status.upstream = value
+                elif key == 'branch.ab':
+                    ahead, _, behind = value.partition(' ')
+                    status.ahead = int(ahead.lstrip('+') or 0)
+                    status.behind = int(behind.lstrip('-') or 0)
+                continue
+
+            kind = record[0]
+            if kind not in path_field:
+                continue
+            if kind == '!':
+                # Ignored files never need committing
+                continue
+            status.entries.append(record.split(' ', path_field[kind])[-1])
+            if kind == '2':
+                # Renames carry the original path as an extra record
+                i += 1
+
+        return status
+
+    async def _has_uncommitted_changes(
+        self,
+        cwd: Optional[StrPath] = None,
+        epic_id: Optional[int] = None
+    ) -> bool:
+        """
+        Check if working directory has uncommitted changes.
+
+        When epic_id is given, the manager tracks changes, and the worktree
+        was known clean within CLEAN_STATUS_TTL seconds and hasn't been
+        marked dirty since, git is not run at all. 'diff-index --quiet' is
+        not used for the slow path because it ignores untracked files,
+        which agents create constantly.
+
+        Args:
+            cwd: Working directory (defaults to project_path)
+            epic_id: Epic whose worktree cwd is (enables the clean fast path)
+
+        Returns:
+            True if there are uncommitted changes, False otherwise
+        """
+        if epic_id is not None and self._is_known_clean(epic_id):
+            return False
+
+        # Any output at all means the tree is dirty, so stop reading (and
+        # kill git) as soon as the first line arrives. _git_cmd() runs status
+        # with --no-optional-locks, so git holds no index.lock to leave behind.
+        has_changes = False
+        lines = self._run_git_stream_lines(
+            ['status', '--porcelain'],
+            cwd=cwd,
+            timeout=10
+        )
+        try:
+            async for _ in lines:
+                has_changes = True
+                break
+        finally:
+            await lines.aclose()
+
+        if epic_id is not None and not has_changes:
+            self._mark_clean(epic_id)
+
+        logger.debug(f"Uncommitted changes: {has_changes}")
+        return has_changes
+
+    async def _get_conflicted_files(self, cwd: Optional[StrPath] = None) -> List[str]:
+        """
+        List files with unresolved merge conflicts.
+
+        Reads the conflict entries straight from the index via pygit2 when it
+        is installed; otherwise falls back to parsing UU/AA/DD lines from
+        'git status --short'.
+
+        Args:
+            cwd: Working directory (defaults to project_path)
+
+        Returns:
+            List of conflicted file paths
+
+        Raises:
+            GitCommandError: If git status fails
+        """
+        if cwd is None:
+            cwd = self._project_dir
+
+        if pygit2 is not None:
             try:
-                output = await self._run_git(
-                    ['merge-tree', merge_base, main_branch, branch],
-                    timeout=30
+                conflicts = pygit2.Repository(os.fspath(cwd)).index.conflicts
+                if conflicts is None:
+                    return []
+                return [
+                    next(entry.path for entry in entries if entry is not None)
+                    for entries in conflicts
+                ]
+            except Exception as e:
+                logger.debug(f"pygit2 conflict listing failed, using git status: {e}")
+
+        status_output = await self._run_git_bytes(['status', '--short'], cwd=cwd, timeout=10)
+        return self._scan_conflicted_paths(status_output)
+
+    @staticmethod
+    def _scan_conflicted_paths(status_output: bytes) -> List[str]:
+        """
+        Extract UU/AA/DD paths from 'git status --short' output.
+
+        Walks the buffer with bytes.find() and compares status bytes
+        directly, so non-matching lines are never split out or decoded.
+
+        Args:
+            status_output: Raw 'git status --short' output
+
+        Returns:
+            List of conflicted file paths
+        """
+        conflicted_files = []
+        end = len(status_output)
+        i = 0
+        while i < end:
+            j = status_output.find(b'\n', i)
+            if j < 0:
+                j = end
+            # Conflict lines look like b'UU path': two equal status bytes + space
+            if (
+                j - i > 3
+                and status_output[i] == status_output[i + 1]
+                and status_output[i] in b'UAD'
+                and status_output[i + 2] == 0x20
+            ):
+                conflicted_files.append(
+                    status_output[i + 3:j].decode('utf-8', errors='replace').strip()
                 )
+            i = j + 1
 
-                # Check if output contains conflict markers
-                has_conflicts = '<<<<<<< ' in output or 'CONFLICT' in output
+        return conflicted_files
 
-                if has_conflicts:
-                    logger.warning(f"Merge conflicts detected for branch {branch}")
-                    logger.debug(f"Conflict preview:\n{output[:500]}")  # Log first 500 chars
-                else:
-                    logger.info(f"No merge conflicts detected for branch {branch}")
+    async def _resolve_ref(self, ref: str) -> str:
+        """
+        Resolve a ref (branch, tag, SHA) to a full commit SHA.
 
-                return has_conflicts
+        Args:
+            ref: Ref to resolve
 
-            except GitCommandError as e:
-                # merge-tree might not be available in older git versions
-                logger.warning(f"merge-tree command failed: {e}")
-                logger.info(f"Cannot perform dry-run conflict check, assuming no conflicts")
-                return False
+        Returns:
+            Commit SHA
+
+        Raises:
+            GitCommandError: If the ref does not exist
+        """
+        sha = await self._batch_check(f'{ref}^{{commit}}')
+        if sha is not None:
+            return sha
+        return await self._run_git(['rev-parse', '--verify', f'{ref}^{{commit}}'], timeout=10)
+
+    async def _batch_check(self, spec: str, timeout: int = 10) -> Optional[str]:
+        """
+        Look up an object through the persistent 'git cat-file --batch-check'.
+
+        Saves a git spawn per lookup. Any failure (missing object, dead or
+        hung process) returns None so the caller can fall back to a one-shot
+        git command, which also produces the proper error.
+
+        Args:
+            spec: Object name, e.g. 'main^{commit}'
+            timeout: Seconds to wait for the answer
+
+        Returns:
+            Object SHA, or None if the lookup did not succeed
+        """
+        if '\n' in spec:
+            return None
+
+        async with self._catfile_lock:
+            try:
+                proc = self._catfile_proc
+                if proc is None or proc.returncode is not None:
+                    proc = await asyncio.create_subprocess_exec(
+                        *self._git_cmd(['cat-file', '--batch-check'], self.project_path),
+                        stdin=asyncio.subprocess.PIPE,
+                        stdout=asyncio.subprocess.PIPE,
+                        stderr=asyncio.subprocess.DEVNULL,
+                        env=self._git_env,
+                        **self._spawn_kwargs
+                    )
+                    self._catfile_proc = proc
+
+                proc.stdin.write(spec.encode('utf-8') + b'\n')
+                await proc.stdin.drain()
+                line = await asyncio.wait_for(proc.stdout.readline(), timeout=timeout)
+            except (OSError, RuntimeError, asyncio.TimeoutError) as e:
+                # uvloop raises RuntimeError, not BrokenPipeError, when git
+                # has already exited and closed the pipe
+                logger.debug(f"cat-file --batch-check failed for {spec}: {e}")
+                await self._stop_catfile()
+                return None
+
+        if not line:
+            # git exited (e.g. not a repository); restarted on next use
+            await self._stop_catfile()
+            return None
+
+        # "<sha> <type> <size>" on success, "<spec> missing" otherwise
+        fields = line.split()
+        if len(fields) != 3:
+            return None
+        return fields[0].decode('ascii')
+
+    async def _stop_catfile(self) -> None:
+        """Terminate the persistent cat-file process, if running."""
+        proc, self._catfile_proc = self._catfile_proc, None
+        if proc is None or proc.returncode is not None:
+            return
+        try:
+            proc.stdin.close()
+            await asyncio.wait_for(proc.wait(), timeout=5)
+        except (OSError, asyncio.TimeoutError):
+            proc.kill()
+            await proc.wait()
+
+    def _schedule_db_update(self, epic_id: int, **fields: Any) -> None:
+        """
+        Write a worktree status update to the database in the background.
+
+        The update runs after any earlier update for the same epic. Failures
+        are logged, not raised. Use flush() to wait for pending updates.
+
+        Args:
+            epic_id: Epic ID (used as the worktree ID)
+            **fields: Columns to update (status, merge_commit, ...)
+        """
+        if not self.db:
+            return
+
+        # Note: This assumes worktree_id = epic_id
+        update = self.db.update_worktree(worktree_id=epic_id, **fields)
+        task = asyncio.create_task(
+            self._apply_db_update(epic_id, update, self._db_update_tails.get(epic_id))
+        )
+        self._db_update_tails[epic_id] = task
+        self._pending_db_tasks.add(task)
+        task.add_done_callback(self._pending_db_tasks.discard)
+
+        def forget_tail(done: asyncio.Task) -> None:
+            if self._db_update_tails.get(epic_id) is done:
+                del self._db_update_tails[epic_id]
+
+        task.add_done_callback(forget_tail)
+
+    async def _apply_db_update(
+        self,
+        epic_id: int,
+        update: Any,
+        previous: Optional[asyncio.Task]
+    ) -> None:
+        """
+        Await one scheduled database update after the epic's previous one.
+
+        Args:
+            epic_id: Epic ID
+            update: update_worktree() awaitable
+            previous: Previously scheduled update task for the epic, if any
+        """
+        if previous is not None:
+            await asyncio.wait([previous])
+        try:
+            await update
+            logger.debug(f"Database updated for epic {epic_id}")
+        except Exception as e:
+            logger.warning(f"Failed to update database for epic {epic_id}: {e}")
+
+    async def flush(self) -> None:
+        """Wait until all background database updates have been written."""
+        while self._pending_db_tasks:
+            await asyncio.gather(*self._pending_db_tasks)
+
+    async def close(self) -> None:
+        """
+        Write pending database updates and release long-lived git helper
+        processes.
+
+        The manager stays usable; helpers are restarted on demand.
+        """
+        await self.flush()
+        await self._stop_catfile()
+
+    async def _merge_tree(self, branch: str) -> Tuple[bool, str]:
+        """
+        Run a git merge-tree dry run of merging a branch into main.
+
+        Results are cached by (main_sha, branch_sha), so repeated checks on
+        unchanged branches skip merge-base/merge-tree entirely.
+
+        Args:
+            branch: Branch name to check
+
+        Returns:
+            Tuple of (has_conflicts, merge-tree output)
+
+        Raises:
+            GitCommandError: If refs cannot be resolved or merge-base fails
+        """
+        main_branch = await self._get_main_branch()
+        main_sha = await self._resolve_ref(main_branch)
+        branch_sha = await self._resolve_ref(branch)
+        key = (main_sha, branch_sha)
+
+        cached = self._conflict_cache.get(key)
+        if cached is not None:
+            self._conflict_cache.move_to_end(key)
+            logger.debug(f"Using cached merge-tree result for {branch}")
+            return cached
+
+        # Get merge base
+        merge_base = await self._run_git(['merge-base', main_sha, branch_sha], timeout=10)
+        logger.debug(f"Merge base: {merge_base}")
+
+        # Use merge-tree for dry-run conflict detection
+        # Format: git merge-tree <base-commit> <branch1> <branch2>
+        try:
+            output = await self._run_git(
+                ['merge-tree', merge_base, main_sha, branch_sha],
+                timeout=30
+            )
+        except GitCommandError as e:
+            # merge-tree might not be available in older git versions
+            logger.warning(f"merge-tree command failed: {e}")
+            logger.info(f"Cannot perform dry-run conflict check, assuming no conflicts")
+            return False, ''
+
+        # Check if output contains conflict markers
+        result = ('<<<<<<< ' in output or 'CONFLICT' in output, output)
+
+        self._conflict_cache[key] = result
+        self._conflict_cache_keys[branch] = key
+        if len(self._conflict_cache) > self.CONFLICT_CACHE_SIZE:
+            self._conflict_cache.popitem(last=False)
+
+        return result
+
+    def _invalidate_conflict_cache(self, branch: str) -> None:
+        """
+        Drop the cached merge-tree result for a branch.
+
+        Args:
+            branch: Branch name whose cached result is stale
+        """
+        key = self._conflict_cache_keys.pop(branch, None)
+        if key is not None:
+            self._conflict_cache.pop(key, None)
+
+    async def _check_merge_conflicts(self, branch: str) -> bool:
+        """
+        Check if merging a branch would cause conflicts using git merge-tree dry run.
+
+        Args:
+            branch: Branch name to check for conflicts
+
+        Returns:
+            True if conflicts would occur, False otherwise
+
+        Raises:
+            GitCommandError: If conflict check fails
+        """
+        logger.info(f"Checking for merge conflicts with branch {branch}")
+
+        try:
+            has_conflicts, output = await self._merge_tree(branch)
+
+            if has_conflicts:
+                logger.warning(f"Merge conflicts detected for branch {branch}")
+                logger.debug(f"Conflict preview:\n{output[:500]}")  # Log first 500 chars
+            else:
+                logger.info(f"No merge conflicts detected for branch {branch}")
+
+            return has_conflicts
 
         except GitCommandError as e:
             logger.error(f"Failed to check for merge conflicts: {e}")
@@ -1171,50 +2473,20 @@ class WorktreeManager:
         worktree_info = self._worktrees[epic_id]
         branch_name = worktree_info.branch
 
-        # Check if there are conflicts
-        has_conflicts = await self._check_merge_conflicts(branch_name)
-
-        if not has_conflicts:
-            logger.info(f"No conflicts detected for epic {epic_id}")
-            return []
-
-        # Get main branch
-        main_branch = await self._get_main_branch()
-
-        # Get merge base
-        merge_base_output = await self._run_git(
-            ['merge-base', main_branch, branch_name],
-            timeout=10
-        )
-        merge_base = merge_base_output.strip()
-
         # Use merge-tree to get detailed conflict information
         try:
-            output = await self._run_git(
-                ['merge-tree', merge_base, main_branch, branch_name],
-                timeout=30
-            )
+            has_conflicts, output = await self._merge_tree(branch_name)
+
+            if not has_conflicts:
+                logger.info(f"No conflicts detected for epic {epic_id}")
+                return []
 
             # Parse conflict information
             conflicts = []
 
             # Look for conflict markers and file information
             # merge-tree output format includes conflict markers and file paths
-            import re
-
-            # Find all files with conflict markers
-            conflict_sections = output.split('<<<<<<< ')
-            for section in conflict_sections[1:]:  # Skip first empty section
-                lines = section.split('\n')
-                # First line after <<<<<<< contains branch info
-                # Look for file path in the section
-                file_match = re.search(r'^\+\+\+ b/(.+)$', section, re.MULTILINE)
-                if file_match:
-                    file_path = file_match.group(1)
-                else:
-                    # Fallback: try to extract from context
-                    file_path = "unknown"
-
+            for file_path in self._scan_conflict_files(output.encode('utf-8')):
                 conflicts.append({
                     'file': file_path,
                     'status': 'both_modified',
@@ -1239,6 +2511,56 @@ class WorktreeManager:
             logger.error(f"Failed to get conflict details: {e}")
             raise
 
+    @staticmethod
+    def _scan_conflict_files(output: bytes) -> List[str]:
+        """
+        Find the file path for each conflict section in merge-tree output.
+
+        A section runs from one '<<<<<<< ' marker to the next; its file is
+        the first '+++ b/<path>' line inside it ("unknown" if none). The
+        buffer is walked once with bytes.find(), without copying sections.
+
+        Args:
+            output: Raw merge-tree output
+
+        Returns:
+            One file path per conflict section
+        """
+        marker = b'<<<<<<< '
+        header = b'+++ b/'
+
+        starts = []
+        i = output.find(marker)
+        while i >= 0:
+            starts.append(i + len(marker))
+            i = output.find(marker, i + len(marker))
+
+        file_paths = []
+        for n, start in enumerate(starts):
+            end = starts[n + 1] - len(marker) if n + 1 < len(starts) else len(output)
+
+            file_path = "unknown"
+
+            # Header must start a line (or the section itself) and name a file
+            pos = start if output.startswith(header, start) else -1
+            while True:
+                if pos < 0:
+                    pos = output.find(b'\n' + header, start, end)
+                    if pos < 0:
+                        break
+                    pos += 1
+                line_end = output.find(b'\n', pos, end)
+                if line_end < 0:
+                    line_end = end
+                if line_end > pos + len(header):
+                    file_path = output[pos + len(header):line_end].decode('utf-8', errors='replace')
+                    break
+                start, pos = line_end, -1
+
+            file_paths.append(file_path)
+
+        return file_paths
+
     async def resolve_conflict(
         self,
         epic_id: int,
@@ -1321,6 +2643,7 @@ class WorktreeManager:
                 # Complete the merge
                 commit_msg = f"Merge epic {epic_id}: {branch_name}"
                 await self._run_git(['commit', '-m', commit_msg], timeout=30)
+                worktree_info.merged = True
 
                 return {
                     'status': 'resolved',
@@ -1330,21 +2653,14 @@ class WorktreeManager:
 
             except GitCommandError as e:
                 # Check if it's a conflict error
-                if 'CONFLICT' not in str(e) and 'conflict' not in str(e).lower():
+                if not e.is_conflict:
                     # Not a conflict, some other error
                     raise
 
                 logger.info(f"Conflicts detected during merge, applying {strategy} strategy")
 
                 # Get list of conflicted files
-                status_output = await self._run_git(['status', '--short'], timeout=10)
-                conflicted_files = []
-                for line in status_output.split('\n'):
-                    if line.startswith('UU ') or line.startswith('AA ') or line.startswith('DD '):
-                        # Extract file path (after status markers)
-                        file_path = line[3:].strip()
-                        conflicted_files.append(file_path)
-
+                conflicted_files = await self._get_conflicted_files()
                 logger.info(f"Found {len(conflicted_files)} conflicted files")
 
                 if not conflicted_files:
@@ -1379,6 +2695,7 @@ class WorktreeManager:
                 # Complete the merge
                 commit_msg = f"Merge epic {epic_id}: {branch_name} (resolved with {strategy})"
                 await self._run_git(['commit', '-m', commit_msg], timeout=30)
+                worktree_info.merged = True
 
                 logger.info(f"Conflicts resolved using {strategy} strategy")
 
@@ -1417,8 +2734,6 @@ class WorktreeManager:
         Returns:
             Sanitized branch name (lowercase, no spaces, valid characters)
         """
-        import re
-
         # Convert to lowercase
         branch = name.lower()
 
@@ -1428,10 +2743,10 @@ class WorktreeManager:
         # Remove Windows invalid characters: : * ? " < > | \ /
         # Also remove any other special characters except alphanumeric, hyphens, dots
         # Keep only: a-z, 0-9, hyphens, dots
-        branch = re.sub(r'[^a-z0-9\-.]', '', branch)
+        branch = _INVALID_BRANCH_CHARS.sub('', branch)
 
         # Replace multiple consecutive hyphens with single hyphen
-        branch = re.sub(r'-+', '-', branch)
+        branch = _MULTI_HYPHEN.sub('-', branch)
 
         # Remove leading/trailing hyphens, dots, and spaces
         branch = branch.strip('-. ')
@@ -1439,11 +2754,8 @@ class WorktreeManager:
         # Handle Windows reserved names (CON, PRN, AUX, NUL, COM1-9, LPT1-9)
         # Check the base name (before any extension-like suffix)
         base_name = branch.split('.')[0] if '.' in branch else branch
-        reserved_names = ['con', 'prn', 'aux', 'nul']
-        reserved_names += [f'com{i}' for i in range(1, 10)]
-        reserved_names += [f'lpt{i}' for i in range(1, 10)]
 
-        if base_name in reserved_names or branch in reserved_names:
+        if base_name in _RESERVED_NAMES or branch in _RESERVED_NAMES:
             branch = f'epic-{branch}'
 
         # Enforce max path length (200 chars for branch name to stay well under Windows MAX_PATH)
@@ -10,22 +10,54 @@ This module provides utilities to:
 - Report validation issues for user awareness
 """
 
+import hashlib
+import heapq
 import logging
+import os
+import re
+import time
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import IO, Any, Dict, Iterator, List, Optional, Set, Tuple
 import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
 
 logger = logging.getLogger(__name__)
 
+# .gitignore entries every project should have, as (label, pattern)
+ESSENTIAL_GITIGNORE_PATTERNS = (
+    ("node_modules", "node_modules/"),
+    ("venv", "venv/"),
+    ("__pycache__", "__pycache__/"),
+    ("env vars", ".env"),
+)
 
+# Matches a whole .gitignore line holding one of the essential patterns,
+# with or without a leading '/' or '**/' and a trailing slash
+_ESSENTIAL_GITIGNORE_RE = re.compile(
+    rb"^[ \t]*(?:\*\*/|/)?("
+    + b"|".join(re.escape(pattern.rstrip("/").encode()) for _, pattern in ESSENTIAL_GITIGNORE_PATTERNS)
+    + rb")/*[ \t]*\r?$",
+    re.MULTILINE
+)
+
+# Tracked files larger than this many bytes are reported
+LARGE_FILE_THRESHOLD = 1_000_000
+
+# Rewrite the commit-graph when it is older than this many seconds
+COMMIT_GRAPH_MAX_AGE = 7 * 24 * 60 * 60
+
+
+@dataclass(slots=True, frozen=True)
 class RepositoryIssue:
     """Represents a repository validation issue."""
 
-    def __init__(self, severity: str, category: str, message: str, fix_available: bool = False):
-        self.severity = severity  # "error", "warning", "info"
-        self.category = category  # "gitignore", "committed_deps", "config"
-        self.message = message
-        self.fix_available = fix_available
+    severity: str  # "error", "warning", "info"
+    category: str  # "gitignore", "committed_deps", "config"
+    message: str
+    fix_available: bool = False
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -36,24 +68,283 @@ class RepositoryIssue:
         }
 
 
-def validate_repository(project_path: Path) -> List[RepositoryIssue]:
+def _git(args: List[str], **kwargs) -> subprocess.CompletedProcess:
     """
-    Validate repository for common issues.
+    Run a read-only git command.
+
+    Optional locks are disabled so git does not refresh and rewrite the
+    index as a side effect of a query.
+    """
+    return subprocess.run(["git", "--no-optional-locks", *args], env=_git_read_env(), **kwargs)
+
+
+def _git_popen(args: List[str], **kwargs) -> subprocess.Popen:
+    """Start a read-only git command for streaming, as _git() would run it."""
+    return subprocess.Popen(["git", "--no-optional-locks", *args], env=_git_read_env(), **kwargs)
+
+
+def _git_read_env() -> Dict[str, str]:
+    """Environment for read-only git commands."""
+    return {**os.environ, "GIT_OPTIONAL_LOCKS": "0"}
+
+
+def _iter_nul_records(stream: IO[bytes], chunk_size: int = 65536) -> Iterator[bytes]:
+    """Yield NUL-terminated records from a binary stream, chunk by chunk."""
+    pending = b''
+    for chunk in iter(lambda: stream.read(chunk_size), b''):
+        records = (pending + chunk).split(b'\0')
+        pending = records.pop()
+        yield from records
+    if pending:
+        yield pending
+
+
+def _read_gitignore(project_path: Path) -> Optional[bytes]:
+    """Read .gitignore as raw bytes, or return None if the project has none."""
+    try:
+        return (project_path / ".gitignore").read_bytes()
+    except FileNotFoundError:
+        return None
+
+
+def _gitignore_entries(content: Optional[bytes]) -> frozenset:
+    """
+    Tokenize .gitignore content into a set of byte patterns.
+
+    Blank lines and comments are dropped, and a leading '/' or '**/' and
+    trailing slashes are removed, so '/node_modules', '**/node_modules' and
+    'node_modules/' all compare equal to 'node_modules'. The patterns
+    checked here are ASCII, so the content is never decoded.
+    """
+    if not content:
+        return frozenset()
+    entries = (line.strip() for line in content.splitlines())
+    return frozenset(
+        entry.removeprefix(b'**/').removeprefix(b'/').rstrip(b'/')
+        for entry in entries
+        if entry and not entry.startswith(b'#')
+    )
+
+
+def _ensure_commit_graph(project_path: Path) -> None:
+    """
+    Write a commit-graph with changed-path Bloom filters if missing or stale.
+
+    The filters let path-limited history queries skip commits that did not
+    touch the requested paths. Failures are logged and otherwise ignored.
+
+    Args:
+        project_path: Path to the project repository
+    """
+    # Ask git where the object store is: a linked worktree or submodule has
+    # a .git file, and its objects live in another directory
+    try:
+        git_path = _git(
+            ["rev-parse", "--git-path", "objects/info"],
+            cwd=project_path,
+            capture_output=True,
+            text=True,
+            timeout=10,
+            check=True
+        )
+    except (subprocess.CalledProcessError, subprocess.TimeoutExpired, OSError) as e:
+        logger.debug(f"Could not locate objects directory for {project_path}: {e}")
+        return
+    # Relative to project_path unless git printed an absolute path
+    objects_info = project_path / git_path.stdout.strip()
+    mtimes = []
+    for graph in (objects_info / "commit-graph",
+                  objects_info / "commit-graphs" / "commit-graph-chain"):
+        try:
+            mtimes.append(graph.stat().st_mtime)
+        except OSError:
+            continue
+
+    if mtimes and time.time() - max(mtimes) < COMMIT_GRAPH_MAX_AGE:
+        return
+
+    try:
+        subprocess.run(
+            ["git", "commit-graph", "write", "--reachable", "--changed-paths"],
+            cwd=project_path,
+            capture_output=True,
+            timeout=30,
+            check=True
+        )
+    except (subprocess.CalledProcessError, subprocess.TimeoutExpired, OSError) as e:
+        logger.debug(f"Could not write commit-graph for {project_path}: {e}")
+
+
+@lru_cache(maxsize=64)
+def _probe_history(project_dir: str, refs_digest: str, dependency_dirs: Tuple[str, ...]) -> frozenset:
+    """
+    Return the dependency directories that appear anywhere in git history.
+
+    Cached on the digest of every ref tip, so repeated validations reuse
+    the result until a ref moves.
+
+    Raises:
+        subprocess.CalledProcessError: If the history scan fails
+    """
+    project_path = Path(project_dir)
+    _ensure_commit_graph(project_path)
+    result = _git(
+        ["log", "--all", "--pretty=format:", "--name-only",
+         "--diff-filter=A", "-z", "--", *dependency_dirs],
+        cwd=project_path,
+        capture_output=True,
+        text=True,
+        timeout=30,
+        check=True
+    )
+    # Match the top-level component of every path ever added
+    return frozenset(
+        path.lstrip('\n').split('/', 1)[0]
+        for path in result.stdout.split('\0')
+    ) & frozenset(dependency_dirs)
+
+
+def _scan_history(project_path: Path, dependency_dirs: List[str]) -> frozenset:
+    """Find dependency directories in git history, using the cached probe."""
+    if not dependency_dirs:
+        # An empty pathspec would make git log walk every path
+        return frozenset()
+
+    refs = _git(
+        ["rev-parse", "HEAD", "--all"],
+        cwd=project_path,
+        capture_output=True,
+        timeout=10
+    )
+    if refs.returncode != 0:
+        # Unborn HEAD: there is no history to scan yet
+        return frozenset()
+
+    refs_digest = hashlib.sha1(refs.stdout).hexdigest()
+    try:
+        return _probe_history(str(project_path.resolve()), refs_digest, tuple(dependency_dirs))
+    except subprocess.CalledProcessError as e:
+        logger.debug(f"History scan failed for {project_path}: {e}")
+        return frozenset()
+
+
+def _scan_index(
+    project_path: Path,
+    dependency_dirs: List[str],
+    limit: int = 5,
+    timeout: float = 10
+) -> Tuple[List[Tuple[str, int]], Set[str]]:
+    """
+    Scan the index for large files and tracked dependency directories.
+
+    'git ls-files -s -z' is streamed into a single 'git cat-file
+    --batch-check' process, and only the top `limit` large files are kept,
+    so memory stays flat however many files the index holds. The same
+    pass records which dependency directories currently have tracked files.
+
+    Args:
+        project_path: Path to the project repository
+        dependency_dirs: Top-level directory names to look for
+        limit: Maximum number of large files to return
+        timeout: Seconds before both git processes are killed
+
+    Returns:
+        Tuple of ((path, size) list largest first, tracked dependency dirs)
+
+    Raises:
+        subprocess.TimeoutExpired: If the scan does not finish in time
+    """
+    dep_dirs = {os.fsencode(d) for d in dependency_dirs}
+    tracked_dirs: Set[bytes] = set()
+
+    ls_files = _git_popen(
+        ["ls-files", "-s", "-z"],
+        cwd=project_path,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL
+    )
+    cat_file = _git_popen(
+        ["cat-file", "--batch-check=%(objectsize) %(rest)", "--buffer"],
+        cwd=project_path,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL
+    )
+
+    def feed() -> None:
+        # Record format: <mode> SP <object> SP <stage> TAB <path>, where mode
+        # is six octal digits and stage one digit, so the fields are sliced
+        # by position instead of split into a list per record.
+        try:
+            for record in _iter_nul_records(ls_files.stdout):
+                meta, _, path = record.partition(b'\t')
+                slash = path.find(b'/')
+                if slash > 0 and path[:slash] in dep_dirs:
+                    tracked_dirs.add(path[:slash])
+                # Submodule commits are not in this object store, and a path
+                # with a newline cannot pass through the line-based input.
+                if meta.startswith(b'160000') or b'\n' in path:
+                    continue
+                cat_file.stdin.write(meta[7:-2] + b' ' + path + b'\n')
+        except (BrokenPipeError, ValueError):
+            pass
+        finally:
+            try:
+                cat_file.stdin.close()
+            except BrokenPipeError:
+                pass
+
+    def kill() -> None:
+        ls_files.kill()
+        cat_file.kill()
+
+    feeder = threading.Thread(target=feed, daemon=True)
+    timer = threading.Timer(timeout, kill)
+    feeder.start()
+    timer.start()
+
+    heap: List[Tuple[int, bytes]] = []
+    try:
+        for line in cat_file.stdout:
+            size, _, path = line.rstrip(b'\n').partition(b' ')
+            if not size.isdigit() or int(size) <= LARGE_FILE_THRESHOLD:
+                continue
+            if len(heap) < limit:
+                heapq.heappush(heap, (int(size), path))
+            else:
+                heapq.heappushpop(heap, (int(size), path))
+        feeder.join()
+        ls_files.wait()
+        cat_file.wait()
+    finally:
+        timed_out = not timer.is_alive()
+        timer.cancel()
+        kill()
+        ls_files.stdout.close()
+        cat_file.stdout.close()
+
+    if timed_out:
+        raise subprocess.TimeoutExpired(ls_files.args, timeout)
+    if ls_files.returncode != 0 or cat_file.returncode != 0:
+        return [], set()
+
+    large_files = [(os.fsdecode(path), size) for size, path in sorted(heap, reverse=True)]
+    return large_files, {os.fsdecode(d) for d in tracked_dirs}
+
+
+def _check_history(project_path: Path, gitignore: Optional[bytes]) -> List[RepositoryIssue]:
+    """
+    Check git history and the index for committed dependencies and large files.
 
     Args:
         project_path: Path to the project repository
+        gitignore: Contents of .gitignore, or None if it does not exist
 
     Returns:
         List of RepositoryIssue objects found
     """
     issues: List[RepositoryIssue] = []
 
-    # Check if this is a git repository
-    git_dir = project_path / ".git"
-    if not git_dir.exists():
-        logger.debug(f"Not a git repository: {project_path}")
-        return issues
-
     # Check for committed dependency directories
     dependency_dirs = [
         "node_modules",
@@ -68,106 +359,150 @@ def validate_repository(project_path: Path) -> List[RepositoryIssue]:
         "out"
     ]
 
-    try:
-        # Check git history for these directories
-        for dep_dir in dependency_dirs:
-            result = subprocess.run(
-                ["git", "log", "--all", "--", dep_dir],
-                cwd=project_path,
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-
-            if result.returncode == 0 and result.stdout.strip():
-                issues.append(RepositoryIssue(
-                    severity="warning",
-                    category="committed_deps",
-                    message=f"Dependency directory '{dep_dir}' found in git history",
-                    fix_available=True
-                ))
-
-        # Check if .gitignore exists
-        gitignore_path = project_path / ".gitignore"
-        if not gitignore_path.exists():
+    # A directory that is absent from the working tree and already ignored
+    # is almost certainly not in history either, so only probe the rest.
+    # This accepts a rare false negative in exchange for skipping git log.
+    with os.scandir(project_path) as entries:
+        on_disk = {entry.name for entry in entries} & set(dependency_dirs)
+    ignored = _gitignore_entries(gitignore)
+    history_dirs = [d for d in dependency_dirs if d in on_disk or d.encode() not in ignored]
+
+    # The index scan finds dependency directories that are tracked now; the
+    # history scan also catches ones that were committed and later removed.
+    # They are independent, so run both at once.
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        history_future = executor.submit(_scan_history, project_path, history_dirs)
+        index_future = executor.submit(_scan_index, project_path, dependency_dirs)
+        found_dirs = history_future.result()
+        large_files, tracked_dirs = index_future.result()
+
+    for dep_dir in dependency_dirs:
+        if dep_dir in tracked_dirs:
             issues.append(RepositoryIssue(
-                severity="error",
-                category="gitignore",
-                message="No .gitignore file found in repository",
+                severity="warning",
+                category="committed_deps",
+                message=f"Dependency directory '{dep_dir}' is committed to the repository",
+                fix_available=True
+            ))
+        elif dep_dir in found_dirs:
+            issues.append(RepositoryIssue(
+                severity="warning",
+                category="committed_deps",
+                message=f"Dependency directory '{dep_dir}' found in git history",
                 fix_available=True
             ))
-        else:
-            # Check if .gitignore has essential exclusions
-            gitignore_content = gitignore_path.read_text()
-            missing_exclusions = []
 
-            essential_patterns = [
-                ("node_modules", "node_modules/"),
-                ("venv", "venv/"),
-                ("__pycache__", "__pycache__/"),
-                ("env vars", ".env")
-            ]
+    # Check for large files in git
+    if large_files:
+        file_list = ', '.join([f"{path} ({size // 1024}KB)" for path, size in large_files[:5]])
+        issues.append(RepositoryIssue(
+            severity="warning",
+            category="large_files",
+            message=f"Large files detected in repository: {file_list}",
+            fix_available=False
+        ))
 
-            for name, pattern in essential_patterns:
-                if pattern not in gitignore_content:
-                    missing_exclusions.append(name)
-
-            if missing_exclusions:
-                issues.append(RepositoryIssue(
-                    severity="warning",
-                    category="gitignore",
-                    message=f".gitignore missing exclusions: {', '.join(missing_exclusions)}",
-                    fix_available=True
-                ))
-
-        # Check for large files in git
-        result = subprocess.run(
-            ["git", "ls-files", "-s"],
-            cwd=project_path,
-            capture_output=True,
-            text=True,
-            timeout=10
-        )
+    return issues
 
-        if result.returncode == 0:
-            large_files = []
-            for line in result.stdout.split('\n'):
-                if not line.strip():
-                    continue
-                parts = line.split()
-                if len(parts) >= 4:
-                    # Format: mode hash stage size path
-                    try:
-                        size = int(parts[3])
-                        if size > 1_000_000:  # > 1MB
-                            path = ' '.join(parts[4:])
-                            large_files.append((path, size))
-                    except (ValueError, IndexError):
-                        continue
-
-            if large_files:
-                file_list = ', '.join([f"{path} ({size // 1024}KB)" for path, size in large_files[:5]])
-                issues.append(RepositoryIssue(
-                    severity="warning",
-                    category="large_files",
-                    message=f"Large files detected in repository: {file_list}",
-                    fix_available=False
-                ))
 
+def _check_gitignore(gitignore: Optional[bytes]) -> List[RepositoryIssue]:
+    """
+    Check that .gitignore exists and has the essential exclusions.
+
+    This is the only part of validation that fix_gitignore() can change.
+
+    Args:
+        gitignore: Contents of .gitignore, or None if it does not exist
+
+    Returns:
+        List of RepositoryIssue objects found
+    """
+    if gitignore is None:
+        return [RepositoryIssue(
+            severity="error",
+            category="gitignore",
+            message="No .gitignore file found in repository",
+            fix_available=True
+        )]
+
+    # Check if .gitignore has essential exclusions
+    found = {
+        match.group(1).decode()
+        for match in _ESSENTIAL_GITIGNORE_RE.finditer(gitignore)
+    }
+    missing_exclusions = [
+        name for name, pattern in ESSENTIAL_GITIGNORE_PATTERNS
+        if pattern.rstrip('/') not in found
+    ]
+
+    if missing_exclusions:
+        return [RepositoryIssue(
+            severity="warning",
+            category="gitignore",
+            message=f".gitignore missing exclusions: {', '.join(missing_exclusions)}",
+            fix_available=True
+        )]
+
+    return []
+
+
+def _validate_sections(
+    project_path: Path
+) -> Tuple[List[RepositoryIssue], List[RepositoryIssue], Optional[bytes]]:
+    """
+    Validate repository, keeping history and .gitignore issues apart.
+
+    Args:
+        project_path: Path to the project repository
+
+    Returns:
+        Tuple of (history_issues, gitignore_issues, gitignore_content), where
+        gitignore_content is None if the file does not exist
+    """
+    history_issues: List[RepositoryIssue] = []
+    gitignore_issues: List[RepositoryIssue] = []
+    gitignore: Optional[bytes] = None
+
+    # Check if this is a git repository. .git is a file, not a directory, in
+    # linked worktrees and submodules, so only its existence is checked.
+    if not (project_path / ".git").exists():
+        logger.debug(f"Not a git repository: {project_path}")
+        return history_issues, gitignore_issues, gitignore
+
+    try:
+        gitignore = _read_gitignore(project_path)
+        history_issues = _check_history(project_path, gitignore)
+        gitignore_issues = _check_gitignore(gitignore)
     except subprocess.TimeoutExpired:
         logger.warning(f"Git command timed out during validation of {project_path}")
     except Exception as e:
         logger.error(f"Error during repository validation: {e}")
 
-    return issues
+    return history_issues, gitignore_issues, gitignore
 
 
-def fix_gitignore(project_path: Path) -> bool:
+def validate_repository(project_path: Path) -> List[RepositoryIssue]:
+    """
+    Validate repository for common issues.
+
+    Args:
+        project_path: Path to the project repository
+
+    Returns:
+        List of RepositoryIssue objects found
+    """
+    history_issues, gitignore_issues, _ = _validate_sections(project_path)
+    return history_issues + gitignore_issues
+
+
+def fix_gitignore(project_path: Path, gitignore: Optional[bytes] = None) -> bool:
     """
     Auto-fix .gitignore by adding missing essential exclusions.
 
     Args:
         project_path: Path to the project repository
+        gitignore: Current .gitignore contents if the caller already read
+            them; read from disk when omitted
 
     Returns:
         True if fixes were applied, False otherwise
@@ -232,12 +567,16 @@ logs/
 """
 
     try:
-        if not gitignore_path.exists():
+        if gitignore is None:
+            gitignore = _read_gitignore(project_path)
+
+        if gitignore is None:
             # Create new .gitignore
             gitignore_path.write_text(standard_gitignore.strip())
             logger.info(f"Created .gitignore at {project_path}")
 
-            # Try to commit it
+            # Try to commit it. --only commits just .gitignore, so changes
+            # the user already staged are not swept into this commit
             try:
                 subprocess.run(
                     ["git", "add", ".gitignore"],
@@ -246,7 +585,8 @@ logs/
                     timeout=5
                 )
                 subprocess.run(
-                    ["git", "commit", "-m", "Add comprehensive .gitignore"],
+                    ["git", "commit", "--only", "-m", "Add comprehensive .gitignore",
+                     "--", ".gitignore"],
                     cwd=project_path,
                     check=True,
                     timeout=5
@@ -258,7 +598,7 @@ logs/
             return True
         else:
             # Append missing patterns to existing .gitignore
-            existing_content = gitignore_path.read_text()
+            existing = _gitignore_entries(gitignore)
             patterns_to_add = []
 
             essential_patterns = [
@@ -277,15 +617,15 @@ logs/
             ]
 
             for pattern in essential_patterns:
-                if pattern not in existing_content:
+                if pattern.rstrip('/').encode() not in existing:
                     patterns_to_add.append(pattern)
 
             if patterns_to_add:
                 # Add missing patterns
-                updated_content = existing_content.rstrip() + "\n\n# Auto-added by YokeFlow validation\n"
-                updated_content += "\n".join(patterns_to_add) + "\n"
+                updated_content = gitignore.rstrip() + b"\n\n# Auto-added by YokeFlow validation\n"
+                updated_content += "\n".join(patterns_to_add).encode() + b"\n"
 
-                gitignore_path.write_text(updated_content)
+                gitignore_path.write_bytes(updated_content)
                 logger.info(f"Added {len(patterns_to_add)} missing patterns to .gitignore")
 
                 return True
@@ -308,8 +648,11 @@ def get_repository_issues(project_path: Path) -> Dict[str, Any]:
     Returns:
         Dictionary containing validation results and issue details
     """
-    issues = validate_repository(project_path)
+    return _build_report(project_path, validate_repository(project_path))
+
 
+def _build_report(project_path: Path, issues: List[RepositoryIssue]) -> Dict[str, Any]:
+    """Summarize validation issues into a report dictionary."""
     # Categorize issues by severity
     errors = [i for i in issues if i.severity == "error"]
     warnings = [i for i in issues if i.severity == "warning"]
@@ -344,15 +687,20 @@ def run_validation(project_path: Path, auto_fix: bool = True) -> Dict[str, Any]:
     logger.info(f"Running repository validation for {project_path}")
 
     # Get initial issues
-    report = get_repository_issues(project_path)
+    history_issues, gitignore_issues, gitignore = _validate_sections(project_path)
+    report = _build_report(project_path, history_issues + gitignore_issues)
 
     if auto_fix and report["fixable_issues"] > 0:
         logger.info(f"Auto-fixing {report['fixable_issues']} issues...")
-        fixed = fix_gitignore(project_path)
+        fixed = fix_gitignore(project_path, gitignore)
 
         if fixed:
-            # Re-run validation to get updated report
-            report = get_repository_issues(project_path)
+            # Only .gitignore changed, so re-check just that section
+            try:
+                gitignore_issues = _check_gitignore(_read_gitignore(project_path))
+            except Exception as e:
+                logger.error(f"Error re-checking .gitignore: {e}")
+            report = _build_report(project_path, history_issues + gitignore_issues)
             report["auto_fix_applied"] = True
         else:
             report["auto_fix_applied"] = False
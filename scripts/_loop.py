@@ -0,0 +1,41 @@
+"""
+Shared event loop for YokeFlow scripts.
+
+run() replaces asyncio.run(): the loop is created on first use and reused
+by later calls in the same process, so a driver that invokes several
+script entry points does not build and tear down a loop for each one. The
+loop is finalized at interpreter exit the way asyncio.run() would do it:
+leftover tasks are cancelled, async generators and the default executor
+(used by asyncio.to_thread) are shut down, and the loop is closed.
+
+Set YOKEFLOW_UVLOOP=1 to create the loop with uvloop (installed with
+uvicorn[standard]).
+"""
+
+import asyncio
+import atexit
+import os
+from typing import Any, Coroutine, Optional, TypeVar
+
+T = TypeVar("T")
+
+_runner: Optional[asyncio.Runner] = None
+
+
+def _new_loop() -> asyncio.AbstractEventLoop:
+    if os.getenv("YOKEFLOW_UVLOOP") == "1":
+        try:
+            import uvloop
+            return uvloop.new_event_loop()
+        except ImportError:
+            print("Warning: YOKEFLOW_UVLOOP=1 but uvloop is not installed")
+    return asyncio.new_event_loop()
+
+
+def run(coro: Coroutine[Any, Any, T]) -> T:
+    """Run a coroutine to completion on the process-wide script loop."""
+    global _runner
+    if _runner is None:
+        _runner = asyncio.Runner(loop_factory=_new_loop)
+        atexit.register(_runner.close)
+    return _runner.run(coro)
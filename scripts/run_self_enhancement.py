@@ -20,68 +20,217 @@ Options:
     --max-concurrency N     Number of concurrent agents (1-10, default: 3)
     --merge-strategy TYPE   Worktree merge strategy: 'regular' or 'squash' (default: regular)
     --max-sessions N        Max coding sessions (sequential mode only)
+    --quiet                 Don't print agent progress lines
 
 Environment:
     Requires DATABASE_URL and CLAUDE_CODE_OAUTH_TOKEN in .env
+    Set YOKEFLOW_UVLOOP=1 in the shell to run on uvloop (installed with
+    uvicorn[standard]); .env is only loaded once the arguments are valid
 """
 
-import asyncio
 import argparse
+import asyncio
+import hashlib
+import json
+import os
 import sys
 from pathlib import Path
+from typing import TYPE_CHECKING, Awaitable, Callable, Dict, List, Optional
 from uuid import UUID
 
 # Add parent to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from dotenv import load_dotenv
-load_dotenv(Path(__file__).parent.parent / ".env")
+from _loop import run
+
+if TYPE_CHECKING:
+    from core.orchestrator import AgentOrchestrator
 
-from core.orchestrator import AgentOrchestrator
-from core.database_connection import DatabaseManager
+# Loaded by main() after argument validation, so --help and usage errors
+# never read .env or import core
+ENV_FILE = Path(__file__).parent.parent / ".env"
 
 
 PROJECT_NAME = "yokeflow-enhancement"
 
+# Resolved project ID, keyed by project name and database so a different
+# DATABASE_URL never reuses it. Cleared by setup_self_enhancement.py, and by
+# main() when the orchestrator no longer knows the cached ID.
+PROJECT_ID_CACHE = Path.home() / ".cache" / "yokeflow" / "project_id.json"
+
+
+class ProgressSink:
+    """
+    Buffers progress lines and writes them to stdout in batches.
+
+    Progress events arrive in bursts during tool use; writing each line
+    with its own print() blocks the event loop on every event. Lines are
+    queued instead and a background task flushes up to `max_batch` of them
+    with a single write every `interval` seconds.
+    """
+
+    def __init__(self, interval: float = 0.05, max_batch: int = 64):
+        self.interval = interval
+        self.max_batch = max_batch
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._drain())
+
+    def write(self, line: str) -> None:
+        """Queue a line for output."""
+        self.queue.put_nowait(line)
+
+    async def _drain(self) -> None:
+        while True:
+            lines = [await self.queue.get()]
+            while len(lines) < self.max_batch and not self.queue.empty():
+                lines.append(self.queue.get_nowait())
+
+            closing = None in lines
+            if closing:
+                lines = lines[:lines.index(None)]
+            if lines:
+                sys.stdout.write("\n".join(lines) + "\n")
+                sys.stdout.flush()
+            if closing:
+                return
+            await asyncio.sleep(self.interval)
+
+    async def aclose(self) -> None:
+        """Flush queued lines and stop the writer task."""
+        self.queue.put_nowait(None)
+        await self._task
+
+
+def _format_text(event: dict) -> Optional[str]:
+    text = event.get('text', '')[:100]
+    return f"  [TEXT] {text}..." if text else None
+
+
+# Progress line formatters keyed by event type; unlisted events are ignored
+INIT_EVENT_FORMATTERS: Dict[str, Callable[[dict], Optional[str]]] = {
+    'tool_use': lambda e: f"  [TOOL] {e.get('tool_name', 'unknown')}",
+    'thinking': lambda e: "  [THINKING] ...",
+    'text': _format_text,
+}
+
+CODING_EVENT_FORMATTERS: Dict[str, Callable[[dict], Optional[str]]] = {
+    'tool_use': lambda e: f"  [TOOL] {e.get('tool_name', 'unknown')}",
+    'session_started': lambda e: f"\n>>> Session {e.get('session_number', '?')} started",
+    'session_complete': lambda e: f"<<< Session {e.get('session_number', '?')} complete",
+    'batch_started': lambda e: f"\n>>> Batch {e.get('batch_number', '?')} started ({e.get('task_count', '?')} tasks)",
+    'batch_complete': lambda e: f"<<< Batch {e.get('batch_number', '?')} complete",
+    'task_started': lambda e: f"  [TASK] Started: {e.get('task_description', 'unknown')}",
+    'task_complete': lambda e: f"  [TASK] Complete: {e.get('task_description', 'unknown')}",
+}
+
+
+def make_progress_callback(
+    sink: ProgressSink,
+    formatters: Dict[str, Callable[[dict], Optional[str]]],
+    quiet: bool = False
+) -> Optional[Callable[[dict], Awaitable[None]]]:
+    """
+    Build a progress callback that formats events with one dict lookup.
+
+    Returns None when quiet, so the orchestrator skips progress events
+    entirely instead of formatting lines nobody reads.
+    """
+    if quiet:
+        return None
+
+    async def progress_callback(event):
+        """Handle progress events."""
+        fmt = formatters.get(event.get('type'))
+        if fmt:
+            line = fmt(event)
+            if line:
+                sink.write(line)
+
+    return progress_callback
+
+
+def _project_cache_key() -> str:
+    # Hashed so the cache file never holds database credentials
+    raw = f"{PROJECT_NAME}\0{os.getenv('DATABASE_URL', '')}"
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def _read_cached_project_id() -> Optional[UUID]:
+    try:
+        data = json.loads(PROJECT_ID_CACHE.read_text())
+        if data.get('key') == _project_cache_key():
+            return UUID(data['project_id'])
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        pass
+    return None
+
+
+def _write_cached_project_id(project_id: UUID) -> None:
+    try:
+        PROJECT_ID_CACHE.parent.mkdir(parents=True, exist_ok=True)
+        tmp = PROJECT_ID_CACHE.with_suffix('.tmp')
+        tmp.write_text(json.dumps({'key': _project_cache_key(), 'project_id': str(project_id)}))
+        os.replace(tmp, PROJECT_ID_CACHE)
+    except OSError:
+        pass
+
+
+def clear_project_id_cache() -> None:
+    """Forget the cached project ID (after the project is recreated)."""
+    try:
+        PROJECT_ID_CACHE.unlink()
+    except FileNotFoundError:
+        pass
+
+
+async def get_project_id() -> Optional[UUID]:
+    """Get the project ID for yokeflow-enhancement, or None if it does not exist."""
+    cached = _read_cached_project_id()
+    if cached:
+        return cached
+
+    from core.database_connection import DatabaseManager
 
-async def get_project_id() -> UUID:
-    """Get the project ID for yokeflow-enhancement."""
     async with DatabaseManager() as db:
         project = await db.get_project_by_name(PROJECT_NAME)
         if not project:
-            print(f"ERROR: Project '{PROJECT_NAME}' not found")
-            print("Run: python scripts/setup_self_enhancement.py")
-            sys.exit(1)
+            return None
+        _write_cached_project_id(project['id'])
         return project['id']
 
 
-async def run_initialization(project_id: UUID):
+def _exit_project_not_found() -> None:
+    print(f"ERROR: Project '{PROJECT_NAME}' not found")
+    print("Run: python scripts/setup_self_enhancement.py")
+    sys.exit(1)
+
+
+async def run_initialization(
+    project_id: UUID,
+    orchestrator: Optional["AgentOrchestrator"] = None,
+    quiet: bool = False
+):
     """Run initialization session (Session 0)."""
     print(f"\n{'='*60}")
     print(f"Running Initialization for {PROJECT_NAME}")
     print(f"Project ID: {project_id}")
     print(f"{'='*60}\n")
 
-    orchestrator = AgentOrchestrator(verbose=True)
-
-    async def progress_callback(event):
-        """Handle progress events."""
-        event_type = event.get('type', 'unknown')
-        if event_type == 'tool_use':
-            print(f"  [TOOL] {event.get('tool_name', 'unknown')}")
-        elif event_type == 'thinking':
-            print(f"  [THINKING] ...")
-        elif event_type == 'text':
-            text = event.get('text', '')[:100]
-            if text:
-                print(f"  [TEXT] {text}...")
+    if orchestrator is None:
+        from core.orchestrator import AgentOrchestrator
+        orchestrator = AgentOrchestrator(verbose=True)
+    sink = ProgressSink()
+    progress_callback = make_progress_callback(sink, INIT_EVENT_FORMATTERS, quiet)
 
     try:
-        session = await orchestrator.start_initialization(
-            project_id=project_id,
-            initializer_model='opus',
-            progress_callback=progress_callback
-        )
+        try:
+            session = await orchestrator.start_initialization(
+                project_id=project_id,
+                initializer_model='opus',
+                progress_callback=progress_callback
+            )
+        finally:
+            await sink.aclose()
         print(f"\nInitialization complete!")
         print(f"Session ID: {session.session_id}")
         print(f"Status: {session.status}")
@@ -96,7 +245,9 @@ async def run_coding(
     max_sessions: int = None,
     parallel: bool = False,
     max_concurrency: int = 3,
-    merge_strategy: str = 'regular'
+    merge_strategy: str = 'regular',
+    orchestrator: Optional["AgentOrchestrator"] = None,
+    quiet: bool = False
 ):
     """Run coding sessions.
 
@@ -106,6 +257,8 @@ async def run_coding(
         parallel: Enable parallel execution of tasks
         max_concurrency: Number of concurrent agents (1-10)
         merge_strategy: Worktree merge strategy ('regular' or 'squash')
+        orchestrator: Orchestrator to reuse; a new one is created if omitted
+        quiet: Don't print agent progress lines
     """
     print(f"\n{'='*60}")
     print(f"Running Coding Sessions for {PROJECT_NAME}")
@@ -120,48 +273,40 @@ async def run_coding(
         print(f"Parallel Execution: DISABLED (sequential mode)")
     print(f"{'='*60}\n")
 
-    orchestrator = AgentOrchestrator(verbose=True)
-
-    async def progress_callback(event):
-        """Handle progress events."""
-        event_type = event.get('type', 'unknown')
-        if event_type == 'tool_use':
-            print(f"  [TOOL] {event.get('tool_name', 'unknown')}")
-        elif event_type == 'session_started':
-            print(f"\n>>> Session {event.get('session_number', '?')} started")
-        elif event_type == 'session_complete':
-            print(f"<<< Session {event.get('session_number', '?')} complete")
-        elif event_type == 'batch_started':
-            print(f"\n>>> Batch {event.get('batch_number', '?')} started ({event.get('task_count', '?')} tasks)")
-        elif event_type == 'batch_complete':
-            print(f"<<< Batch {event.get('batch_number', '?')} complete")
-        elif event_type == 'task_started':
-            print(f"  [TASK] Started: {event.get('task_description', 'unknown')}")
-        elif event_type == 'task_complete':
-            print(f"  [TASK] Complete: {event.get('task_description', 'unknown')}")
+    if orchestrator is None:
+        from core.orchestrator import AgentOrchestrator
+        orchestrator = AgentOrchestrator(verbose=True)
+    sink = ProgressSink()
+    progress_callback = make_progress_callback(sink, CODING_EVENT_FORMATTERS, quiet)
 
     try:
         if parallel:
             # Run parallel execution
             print("Starting parallel execution...")
-            session = await orchestrator.start_coding_sessions(
-                project_id=project_id,
-                coding_model='sonnet',
-                progress_callback=progress_callback,
-                parallel=True,
-                max_concurrency=max_concurrency
-            )
+            try:
+                session = await orchestrator.start_coding_sessions(
+                    project_id=project_id,
+                    coding_model='sonnet',
+                    progress_callback=progress_callback,
+                    parallel=True,
+                    max_concurrency=max_concurrency
+                )
+            finally:
+                await sink.aclose()
             print(f"\nParallel execution complete: {session.status}")
             return session
         else:
             # Run sequential coding sessions
-            session = await orchestrator.start_coding_sessions(
-                project_id=project_id,
-                coding_model='sonnet',
-                max_iterations=max_sessions or 0,  # 0 = unlimited
-                progress_callback=progress_callback,
-                parallel=False,
-            )
+            try:
+                session = await orchestrator.start_coding_sessions(
+                    project_id=project_id,
+                    coding_model='sonnet',
+                    max_iterations=max_sessions or 0,  # 0 = unlimited
+                    progress_callback=progress_callback,
+                    parallel=False,
+                )
+            finally:
+                await sink.aclose()
             print(f"\nSequential execution complete: {session.status}")
             return session
 
@@ -170,7 +315,17 @@ async def run_coding(
         raise
 
 
-async def main():
+def build_parser():
+    """Build the full command-line parser."""
+    def concurrency(value: str) -> int:
+        try:
+            count = int(value)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"invalid int value: '{value}'")
+        if count < 1 or count > 10:
+            raise argparse.ArgumentTypeError(f"must be between 1 and 10 (got {count})")
+        return count
+
     parser = argparse.ArgumentParser(
         description="Run YokeFlow self-enhancement",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -202,7 +357,7 @@ Note: Parallel execution is opt-in. Use --parallel flag to enable it.
     )
     parser.add_argument(
         '--max-concurrency',
-        type=int,
+        type=concurrency,
         default=3,
         help='Number of concurrent agents (1-10, default: 3)'
     )
@@ -213,27 +368,19 @@ Note: Parallel execution is opt-in. Use --parallel flag to enable it.
         default='regular',
         help='Worktree merge strategy (default: regular)'
     )
-    args = parser.parse_args()
+    parser.add_argument('--quiet', action='store_true', help="Don't print agent progress lines")
+    return parser
 
-    if not (args.init or args.coding or args.all):
-        parser.print_help()
-        print("\nError: Specify --init, --coding, or --all")
-        sys.exit(1)
 
-    # Validate max_concurrency
-    if args.max_concurrency < 1 or args.max_concurrency > 10:
-        print(f"Error: --max-concurrency must be between 1 and 10 (got {args.max_concurrency})")
-        sys.exit(1)
+def parse_args(argv: Optional[List[str]] = None):
+    """Parse command-line arguments (sys.argv[1:] when argv is omitted)."""
+    return build_parser().parse_args(argv)
 
-    # Warn if max_sessions is used with parallel mode
-    if args.parallel and args.max_sessions:
-        print("Warning: --max-sessions is ignored in parallel mode")
-
-    project_id = await get_project_id()
-    print(f"Found project: {project_id}")
 
+async def run_phases(args, project_id: UUID, orchestrator: "AgentOrchestrator") -> None:
+    """Run the phases selected on the command line."""
     if args.init or args.all:
-        await run_initialization(project_id)
+        await run_initialization(project_id, orchestrator=orchestrator, quiet=args.quiet)
 
     if args.coding or args.all:
         await run_coding(
@@ -241,11 +388,61 @@ Note: Parallel execution is opt-in. Use --parallel flag to enable it.
             max_sessions=args.max_sessions,
             parallel=args.parallel,
             max_concurrency=args.max_concurrency,
-            merge_strategy=args.merge_strategy
+            merge_strategy=args.merge_strategy,
+            orchestrator=orchestrator,
+            quiet=args.quiet
         )
 
+
+async def main(argv: Optional[List[str]] = None):
+    args = parse_args(argv)
+
+    if not (args.init or args.coding or args.all):
+        build_parser().print_help()
+        print("\nError: Specify --init, --coding, or --all")
+        sys.exit(1)
+
+    # Warn if max_sessions is used with parallel mode
+    if args.parallel and args.max_sessions:
+        print("Warning: --max-sessions is ignored in parallel mode")
+
+    from dotenv import load_dotenv
+    load_dotenv(ENV_FILE)
+
+    from core.orchestrator import AgentOrchestrator
+
+    # Loading the orchestrator's config does not depend on the project
+    # lookup, so build it off the loop while the database is queried. The
+    # same orchestrator then serves both phases of --all.
+    async with asyncio.TaskGroup() as tg:
+        project_task = tg.create_task(get_project_id())
+        orchestrator_task = tg.create_task(asyncio.to_thread(AgentOrchestrator, verbose=True))
+    # Exit only once the TaskGroup is done; SystemExit raised inside a task
+    # escapes the loop instead of being reported
+    project_id = project_task.result()
+    if project_id is None:
+        _exit_project_not_found()
+    orchestrator = orchestrator_task.result()
+    print(f"Found project: {project_id}")
+
+    try:
+        await run_phases(args, project_id, orchestrator)
+    except ValueError as e:
+        if str(e) != f"Project not found: {project_id}":
+            raise
+        # A cached ID is only verified on first use; if the project was
+        # deleted or recreated since, look it up by name again
+        clear_project_id_cache()
+        fresh_id = await get_project_id()
+        if fresh_id is None:
+            _exit_project_not_found()
+        if fresh_id == project_id:
+            raise
+        print(f"Cached project ID was stale, found project: {fresh_id}")
+        await run_phases(args, fresh_id, orchestrator)
+
     print("\nDone!")
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())
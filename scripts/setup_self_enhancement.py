@@ -9,18 +9,18 @@ Usage:
     python scripts/setup_self_enhancement.py
 """
 
-import asyncio
+import mmap
 import sys
 from pathlib import Path
 
 # Add parent to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from dotenv import load_dotenv
-load_dotenv(Path(__file__).parent.parent / ".env")
-
+# core.database_connection loads the agent .env on import
 from core.database_connection import DatabaseManager
 from core.orchestrator import AgentOrchestrator
+from run_self_enhancement import clear_project_id_cache
+from _loop import run
 
 
 async def setup_self_enhancement():
@@ -41,12 +41,14 @@ async def setup_self_enhancement():
         print("Copy yokeflow_enhancement_spec.txt to the worktree as app_spec.txt")
         return None
 
+    spec_size = spec_file.stat().st_size
+    if not spec_size:
+        print(f"ERROR: app_spec.txt is empty at {spec_file}")
+        return None
+
     print(f"Worktree: {worktree_path}")
     print(f"Spec file: {spec_file}")
-
-    # Read the spec content (for reference)
-    spec_content = spec_file.read_text(encoding='utf-8')
-    print(f"Spec length: {len(spec_content)} chars")
+    print(f"Spec length: {spec_size} bytes")
 
     async with DatabaseManager() as db:
         # Check if project already exists
@@ -56,6 +58,7 @@ async def setup_self_enhancement():
             confirm = input("Delete and recreate? (y/n): ").strip().lower()
             if confirm == 'y':
                 await db.delete_project(existing['id'])
+                clear_project_id_cache()
                 print("Deleted existing project")
             else:
                 print("Keeping existing project")
@@ -67,17 +70,21 @@ async def setup_self_enhancement():
 
     orchestrator = AgentOrchestrator(verbose=False)
 
-    project = await orchestrator.create_project(
-        project_name=project_name,
-        spec_content=spec_content,  # Pass spec content for database storage
-        force=False,
-        sandbox_type='local',  # Local mode for self-enhancement
-        initializer_model='opus',
-        coding_model='sonnet',
-        local_path=str(worktree_path),  # Enhancement mode: use worktree
-    )
+    # Map the spec rather than decoding it; it is only hashed for the database
+    with open(spec_file, 'rb') as f, \
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as spec_bytes:
+        project = await orchestrator.create_project(
+            project_name=project_name,
+            spec_content=spec_bytes,  # Pass spec content for database storage
+            force=False,
+            sandbox_type='local',  # Local mode for self-enhancement
+            initializer_model='opus',
+            coding_model='sonnet',
+            local_path=str(worktree_path),  # Enhancement mode: use worktree
+        )
 
     project_id = project['id']
+    clear_project_id_cache()
     print(f"Created project with ID: {project_id}")
     print(f"Working directory: {project.get('local_path', 'N/A')}")
 
@@ -95,7 +102,7 @@ async def setup_self_enhancement():
 
 
 if __name__ == "__main__":
-    project_id = asyncio.run(setup_self_enhancement())
+    project_id = run(setup_self_enhancement())
     if project_id:
         print(f"\nSuccess! Project ID: {project_id}")
     else:
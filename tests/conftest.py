@@ -0,0 +1,21 @@
+"""
+Shared pytest configuration for the YokeFlow test suite.
+"""
+
+import asyncio
+
+import pytest
+
+try:
+    import uvloop
+except ImportError:  # not installed on Windows or without uvicorn[standard]
+    uvloop = None
+
+
+# optionalhook: older pytest-asyncio releases without this hook ignore it
+@pytest.hookimpl(optionalhook=True)
+def pytest_asyncio_loop_factories(config, item):
+    """Run async tests on uvloop when it is installed."""
+    if uvloop is not None:
+        return {"uvloop": uvloop.new_event_loop}
+    return {"asyncio": asyncio.new_event_loop}
@@ -15,11 +15,13 @@ from contextlib import asynccontextmanager
 # Setup path
 sys.path.insert(0, '.')
 
-@dataclass
+@dataclass(slots=True)
 class MockConfig:
     pass
 
 class MockDBConnection:
+    __slots__ = ('test_data',)
+
     def __init__(self, test_data):
         self.test_data = test_data
 
@@ -27,6 +29,8 @@ class MockDBConnection:
         return self.test_data
 
 class MockDB:
+    __slots__ = ('test_data',)
+
     def __init__(self, test_data=None):
         self.test_data = test_data or []
 
@@ -4,6 +4,7 @@ Test batch execution flow.
 
 import sys
 import asyncio
+from dataclasses import replace
 from pathlib import Path
 from unittest.mock import AsyncMock, Mock, patch
 from uuid import uuid4
@@ -13,17 +14,20 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from core.parallel.parallel_executor import ParallelExecutor, ExecutionResult
 
+# Every mocked task succeeds the same way; only task_id differs
+SUCCESS_TEMPLATE = ExecutionResult(task_id=0, success=True, duration=1.0, cost=0.01)
+
 
 class MockDatabase:
     """Mock database for testing."""
 
+    __slots__ = ('batches', 'batch_statuses', 'tasks')
+
     def __init__(self):
         self.batches = []
         self.batch_statuses = {}
-
-    async def get_tasks_with_dependencies(self, project_id):
-        """Return mock tasks with dependencies forming 3 batches."""
-        return [
+        # Mock tasks with dependencies forming 3 batches, built once
+        self.tasks = [
             # Batch 1: No dependencies
             {'id': 1, 'epic_id': 1, 'description': 'Task 1', 'depends_on': [], 'dependency_type': 'hard', 'priority': 1, 'done': False, 'epic_name': 'Epic 1'},
             {'id': 2, 'epic_id': 1, 'description': 'Task 2', 'depends_on': [], 'dependency_type': 'hard', 'priority': 2, 'done': False, 'epic_name': 'Epic 1'},
@@ -35,6 +39,10 @@ class MockDatabase:
             {'id': 4, 'epic_id': 2, 'description': 'Task 4', 'depends_on': [3], 'dependency_type': 'hard', 'priority': 2, 'done': False, 'epic_name': 'Epic 2'},
         ]
 
+    async def get_tasks_with_dependencies(self, project_id):
+        """Return mock tasks with dependencies forming 3 batches."""
+        return self.tasks
+
     async def create_parallel_batch(self, project_id, batch_number, task_ids):
         """Record batch creation."""
         batch = {
@@ -63,20 +71,10 @@ async def test_batch_execution_flow():
         db_connection=mock_db
     )
 
-    # Mock the execute_batch method to return success results
-    async def mock_execute_batch(batch_number, task_ids):
-        """Mock batch execution that returns success for all tasks."""
-        return [
-            ExecutionResult(
-                task_id=task_id,
-                success=True,
-                duration=1.0,
-                cost=0.01
-            )
-            for task_id in task_ids
-        ]
-
-    executor.execute_batch = mock_execute_batch
+    # Mock the execute_batch method to return success results for all tasks
+    executor.execute_batch = AsyncMock(side_effect=lambda batch_number, task_ids: [
+        replace(SUCCESS_TEMPLATE, task_id=task_id) for task_id in task_ids
+    ])
 
     # Mock worktree manager initialization
     executor.worktree_manager.initialize = AsyncMock()
@@ -106,6 +104,10 @@ async def test_batch_execution_flow():
     assert batch3['batch_number'] == 3
     assert set(batch3['task_ids']) == {4}, f"Batch 3 should contain task 4 but got {batch3['task_ids']}"
 
+    # Verify batches were executed in order
+    executed = [call.args[0] for call in executor.execute_batch.await_args_list]
+    assert executed == [1, 2, 3], f"Batches should run in order 1,2,3 but ran {executed}"
+
     # Verify worktree manager was initialized
     executor.worktree_manager.initialize.assert_called_once()
 
@@ -5,6 +5,7 @@ Budget Management Integration Test
 Demonstrates budget management working with actual task recommendations.
 """
 
+from unittest.mock import AsyncMock
 from uuid import uuid4
 from core.learning.model_selector import ModelSelector, ModelTier
 
@@ -25,7 +26,19 @@ class MockConfig:
 class MockDB:
     """Mock database connection for testing."""
     def __init__(self, total_spent=0.0):
-        self.total_spent = total_spent
+        # One row object for every fetchrow; total_spent writes update it
+        self._row = {'total_spent': total_spent}
+        self.fetchrow = AsyncMock(return_value=self._row)
+        # Empty historical performance for the selector's cache refresh
+        self.fetch = AsyncMock(return_value=[])
+
+    @property
+    def total_spent(self):
+        return self._row['total_spent']
+
+    @total_spent.setter
+    def total_spent(self, value):
+        self._row['total_spent'] = value
 
     def acquire(self):
         return self
@@ -36,13 +49,6 @@ class MockDB:
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         pass
 
-    async def fetchrow(self, query, project_id):
-        return {'total_spent': self.total_spent}
-
-    async def fetch(self, query, project_id):
-        # Return empty list for historical performance queries
-        return []
-
 
 def test_budget_management_integration():
     """
@@ -6,8 +6,12 @@ Unit tests for ModelSelector budget management functionality.
 """
 
 import asyncio
+import sys
 from unittest.mock import Mock, AsyncMock, patch
 from uuid import uuid4
+
+import pytest
+
 from core.learning.model_selector import ModelSelector, ModelTier
 
 
@@ -27,7 +31,17 @@ class MockConfig:
 class MockDB:
     """Mock database connection for testing."""
     def __init__(self, total_spent=0.0):
-        self.total_spent = total_spent
+        # One row object for every fetchrow; total_spent writes update it
+        self._row = {'total_spent': total_spent}
+        self.fetchrow = AsyncMock(return_value=self._row)
+
+    @property
+    def total_spent(self):
+        return self._row['total_spent']
+
+    @total_spent.setter
+    def total_spent(self, value):
+        self._row['total_spent'] = value
 
     def acquire(self):
         return self
@@ -38,111 +52,60 @@ class MockDB:
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         pass
 
-    async def fetchrow(self, query, project_id):
-        return {'total_spent': self.total_spent}
-
-
-def test_check_budget_unlimited():
-    """Test budget check with no limit set."""
-    project_id = uuid4()
-    config = MockConfig(budget_limit_usd=None)
-    db = MockDB(total_spent=0.0)
-
-    selector = ModelSelector(project_id, config, db)
-    within_budget, remaining = selector.check_budget()
-
-    assert within_budget is True
-    assert remaining == 999999.0
-    print("[OK] Unlimited budget test passed")
-
-
-def test_check_budget_within_limit():
-    """Test budget check when within limit."""
-    project_id = uuid4()
-    config = MockConfig(budget_limit_usd=100.0)
-    db = MockDB(total_spent=50.0)
 
-    selector = ModelSelector(project_id, config, db)
+@pytest.mark.parametrize(
+    "budget_limit,total_spent,expected_within,expected_remaining",
+    [
+        (None, 0.0, True, 999999.0),    # no limit set
+        (100.0, 50.0, True, 50.0),      # within limit
+        (100.0, 105.0, False, -5.0),    # exceeded
+    ],
+    ids=["unlimited", "within_limit", "exceeded"]
+)
+def test_check_budget(budget_limit, total_spent, expected_within, expected_remaining):
+    """Test budget check against the configured limit."""
+    config = MockConfig(budget_limit_usd=budget_limit)
+    db = MockDB(total_spent=total_spent)
+
+    selector = ModelSelector(uuid4(), config, db)
     within_budget, remaining = selector.check_budget()
 
-    assert within_budget is True
-    assert remaining == 50.0
-    print("[OK] Within budget test passed")
+    assert within_budget is expected_within
+    assert remaining == expected_remaining
 
 
-def test_check_budget_exceeded():
-    """Test budget check when exceeded."""
-    project_id = uuid4()
-    config = MockConfig(budget_limit_usd=100.0)
-    db = MockDB(total_spent=105.0)
-
-    selector = ModelSelector(project_id, config, db)
-    within_budget, remaining = selector.check_budget()
-
-    assert within_budget is False
-    assert remaining == -5.0
-    print("[OK] Budget exceeded test passed")
+@pytest.fixture
+def selector():
+    """Selector with a $100 budget; downgrade tests pass remaining budget directly."""
+    return ModelSelector(uuid4(), MockConfig(budget_limit_usd=100.0), MockDB(total_spent=0.0))
 
 
-def test_downgrade_for_budget_exhausted():
-    """Test model downgrade when budget exhausted."""
-    project_id = uuid4()
-    config = MockConfig(budget_limit_usd=100.0)
-    db = MockDB(total_spent=0.0)
-
-    selector = ModelSelector(project_id, config, db)
-
-    # Test downgrade from OPUS to HAIKU when budget exhausted
+@pytest.mark.parametrize(
+    "remaining_budget,within_budget,expected_model,expected_reason",
+    [
+        (0.5, False, ModelTier.HAIKU, "exhausted"),     # OPUS -> HAIKU when exhausted
+        (5.0, True, ModelTier.SONNET, "low budget"),    # OPUS -> SONNET when low
+    ],
+    ids=["exhausted", "low"]
+)
+def test_downgrade_for_budget(selector, remaining_budget, within_budget, expected_model, expected_reason):
+    """Test model downgrade from OPUS at different budget levels."""
     downgraded, reason = selector._downgrade_for_budget(
-        ModelTier.OPUS, remaining_budget=0.5, within_budget=False
+        ModelTier.OPUS, remaining_budget=remaining_budget, within_budget=within_budget
     )
-    assert downgraded == ModelTier.HAIKU
-    assert "exhausted" in reason
-    print("[OK] Budget exhausted downgrade test passed")
 
+    assert downgraded == expected_model
+    assert expected_reason in reason
 
-def test_downgrade_for_budget_low():
-    """Test model downgrade when budget is low."""
-    project_id = uuid4()
-    config = MockConfig(budget_limit_usd=100.0)
-    db = MockDB(total_spent=0.0)
 
-    selector = ModelSelector(project_id, config, db)
-
-    # Test downgrade from OPUS to SONNET when budget low
-    downgraded, reason = selector._downgrade_for_budget(
-        ModelTier.OPUS, remaining_budget=5.0, within_budget=True
-    )
-    assert downgraded == ModelTier.SONNET
-    assert "low budget" in reason
-    print("[OK] Low budget downgrade test passed")
-
-
-def test_no_downgrade_sufficient_budget():
-    """Test no downgrade when budget is sufficient."""
-    project_id = uuid4()
-    config = MockConfig(budget_limit_usd=100.0)
-    db = MockDB(total_spent=0.0)
-
-    selector = ModelSelector(project_id, config, db)
-
-    # Test no downgrade when budget is sufficient
+def test_no_downgrade_sufficient_budget(selector):
+    """Test that a sufficient budget keeps OPUS with no reason given."""
     downgraded, reason = selector._downgrade_for_budget(
         ModelTier.OPUS, remaining_budget=50.0, within_budget=True
     )
+
     assert downgraded == ModelTier.OPUS
     assert reason == ""
-    print("[OK] No downgrade test passed")
-
 
 if __name__ == "__main__":
-    print("Running budget management tests...\n")
-
-    test_check_budget_unlimited()
-    test_check_budget_within_limit()
-    test_check_budget_exceeded()
-    test_downgrade_for_budget_exhausted()
-    test_downgrade_for_budget_low()
-    test_no_downgrade_sufficient_budget()
-
-    print("\n[OK] All budget management tests passed!")
+    sys.exit(pytest.main([__file__, "-v"]))
@@ -5,7 +5,9 @@ Test script for ModelSelector.recommend_model()
 Tests the model recommendation logic with various complexity levels.
 """
 
+import gc
 import sys
+import weakref
 import pytest
 from dataclasses import dataclass
 from typing import Any
@@ -24,7 +26,7 @@ class MockDB:
 
 # Import the ModelSelector
 sys.path.insert(0, '.')
-from core.learning.model_selector import ModelSelector, ModelTier
+from core.learning.model_selector import ModelSelector, ModelTier, _analyze_text
 
 @pytest.mark.asyncio
 async def test_low_complexity():
@@ -150,6 +152,31 @@ def test_complexity_analysis():
     assert complexity.reasoning_depth > 0.1, "Should have some reasoning depth"
     print("[PASS] Complexity analysis test passed")
 
+def test_complexity_analysis_cached():
+    """Test that scoring is memoized by text across selectors without holding them."""
+    project_id = UUID('00000000-0000-0000-0000-000000000000')
+    task = {
+        'id': 5,
+        'description': 'Add pagination to the task list',
+        'action': 'Implement offset pagination in the list endpoint',
+        'priority': 5
+    }
+
+    _analyze_text.cache_clear()
+    first = ModelSelector(project_id, MockConfig(), MockDB())
+    second = ModelSelector(project_id, MockConfig(), MockDB())
+
+    assert first.analyze_complexity(task) is second.analyze_complexity(task)
+    info = _analyze_text.cache_info()
+    assert (info.hits, info.misses) == (1, 1), f"Expected one hit and one miss, got {info}"
+
+    # The cache is keyed by text alone, so it must not keep selectors alive
+    selector_ref = weakref.ref(first)
+    del first
+    gc.collect()
+    assert selector_ref() is None, "Cached scores should not reference the selector"
+    print("[PASS] Complexity analysis cache test passed")
+
 @pytest.mark.asyncio
 async def test_budget_enforcement():
     """Test that budget constraints are considered in model selection."""
@@ -321,6 +348,7 @@ if __name__ == '__main__':
         await test_medium_complexity()
         await test_high_complexity()
         test_complexity_analysis()  # This one is sync
+        test_complexity_analysis_cached()
         await test_budget_enforcement()
         await test_no_budget_set()
         await test_empty_history()
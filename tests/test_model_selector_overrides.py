@@ -11,6 +11,8 @@ from core.learning.model_selector import ModelSelector, ModelTier
 from unittest.mock import Mock, AsyncMock
 from uuid import uuid4
 
+import pytest
+
 
 class MockConfig:
     """Mock configuration for testing."""
@@ -195,25 +197,4 @@ def test_json_string_metadata():
 
 
 if __name__ == '__main__':
-    print("Testing ModelSelector configuration overrides...\n")
-
-    try:
-        test_task_metadata_override()
-        test_priority_override()
-        test_task_type_override()
-        test_override_priority_order()
-        test_no_override()
-        test_json_string_metadata()
-
-        print("\n" + "="*60)
-        print("All tests PASSED!")
-        print("="*60)
-
-    except AssertionError as e:
-        print(f"\n[FAIL] Test failed: {e}")
-        sys.exit(1)
-    except Exception as e:
-        print(f"\n[ERROR] Unexpected error: {e}")
-        import traceback
-        traceback.print_exc()
-        sys.exit(1)
+    sys.exit(pytest.main([__file__, '-v']))
@@ -21,6 +21,7 @@ from core.parallel.parallel_executor import (
     ExecutionResult,
     RunningAgent
 )
+from core.parallel.worktree_manager import WorktreeInfo
 
 
 def create_mock_db(tasks):
@@ -136,7 +137,7 @@ class TestMultiBatchExecution:
 
             async def mock_execute_batch(batch_num, task_ids):
                 batch_execution_order.append(batch_num)
-                await asyncio.sleep(0.01)  # Simulate work
+                await asyncio.sleep(0)  # Yield to the loop; ordering is what matters
                 return [
                     ExecutionResult(task_id=tid, success=True, duration=0.01, cost=0.001)
                     for tid in task_ids
@@ -354,9 +355,12 @@ class TestCancellation:
             async def mock_run_task(task, worktree_path):
                 tasks_started.append(task['id'])
 
-                # Simulate long-running task
+                # Simulate a long-running agent that stops at the cancel event,
+                # as run_agent_session does, instead of sleeping it out
                 try:
-                    await asyncio.sleep(1.0)
+                    await asyncio.wait_for(executor.cancel_event.wait(), timeout=1.0)
+                    return ExecutionResult(task_id=task['id'], success=False, duration=0.0, error="Cancelled", cost=0.0)
+                except asyncio.TimeoutError:
                     return ExecutionResult(task_id=task['id'], success=True, duration=1.0, cost=0.01)
                 except asyncio.CancelledError:
                     return ExecutionResult(
@@ -396,7 +400,7 @@ class TestCancellation:
                         exec_task = asyncio.create_task(executor.execute())
 
                         # Wait a bit for tasks to start
-                        await asyncio.sleep(0.1)
+                        await asyncio.sleep(0.01)
 
                         # Cancel execution
                         await executor.cancel()
@@ -516,11 +520,12 @@ class TestWorktreeAssignment:
             async def mock_create_worktree(epic_id, epic_name):
                 path = f"{temp_dir}/.worktrees/epic-{epic_id}"
                 worktree_assignments[epic_id] = path
-                return Mock(
+                return WorktreeInfo(
                     path=path,
                     branch=f"epic-{epic_id}-{epic_name}",
                     epic_id=epic_id,
-                    status="active"
+                    status="active",
+                    created_at=datetime.now()
                 )
 
             with patch.object(executor.dependency_resolver, 'resolve') as mock_resolve:
@@ -581,33 +586,17 @@ async def run_all_tests():
     print("="*60)
 
     try:
-        # Single batch tests
-        single = TestSingleBatchExecution()
-        await single.test_single_batch_success()
-
-        # Multi-batch tests
-        multi = TestMultiBatchExecution()
-        await multi.test_multi_batch_sequential()
-
-        # Concurrency tests
-        concurrency = TestConcurrencyLimit()
-        await concurrency.test_concurrency_limit_enforced()
-
-        # Failure handling tests
-        failure = TestFailureHandling()
-        await failure.test_partial_batch_failure()
-
-        # Cancellation tests
-        cancel = TestCancellation()
-        await cancel.test_cancellation_mid_execution()
-
-        # Progress callback tests
-        progress = TestProgressCallback()
-        await progress.test_progress_callback_called()
-
-        # Worktree assignment tests
-        worktree = TestWorktreeAssignment()
-        await worktree.test_worktree_per_epic()
+        # Each test builds its own executor and patches only that instance,
+        # so the suites can share the loop concurrently
+        await asyncio.gather(
+            TestSingleBatchExecution().test_single_batch_success(),
+            TestMultiBatchExecution().test_multi_batch_sequential(),
+            TestConcurrencyLimit().test_concurrency_limit_enforced(),
+            TestFailureHandling().test_partial_batch_failure(),
+            TestCancellation().test_cancellation_mid_execution(),
+            TestProgressCallback().test_progress_callback_called(),
+            TestWorktreeAssignment().test_worktree_per_epic(),
+        )
 
         print("\n" + "="*60)
         print("[SUCCESS] ALL TESTS PASSED (7/7)")
@@ -36,6 +36,8 @@ def test_parallel_executor_initialization():
     # Verify semaphore set to max_concurrency
     assert isinstance(executor.semaphore, asyncio.Semaphore), \
         "Semaphore not initialized"
+    assert isinstance(executor.semaphore, asyncio.BoundedSemaphore), \
+        "Semaphore should be bounded"
     assert executor.semaphore._value == 3, \
         f"Semaphore value should be 3, got {executor.semaphore._value}"
 
@@ -0,0 +1,129 @@
+"""
+Tests for repository validation (.gitignore checks and fixes).
+"""
+
+import subprocess
+import sys
+
+import pytest
+
+
+def git(repo, *args):
+    """Run git in repo and return its stdout."""
+    return subprocess.run(
+        ["git", *args], cwd=repo, check=True, capture_output=True, text=True
+    ).stdout
+
+
+@pytest.fixture(scope="module")
+def validation():
+    """The module under test."""
+    # Imported here so a direct run reaches pytest.main, which puts the
+    # repository root on sys.path (see pytest.ini)
+    from core import validation
+
+    return validation
+
+
+@pytest.fixture
+def repo(tmp_path):
+    """Empty git repository with a committer identity."""
+    git(tmp_path, "init", "-q")
+    git(tmp_path, "config", "user.email", "test@example.com")
+    git(tmp_path, "config", "user.name", "Test User")
+    return tmp_path
+
+
+def test_fix_gitignore_creates_and_commits(validation, repo, monkeypatch):
+    """A missing .gitignore is written and committed on its own."""
+    (repo / "app.py").write_text("print('hi')\n")
+    git(repo, "add", "app.py")
+
+    commands = []
+    real_run = subprocess.run
+
+    def recording_run(args, **kwargs):
+        commands.append(args[1])
+        return real_run(args, **kwargs)
+
+    monkeypatch.setattr(validation.subprocess, "run", recording_run)
+    assert validation.fix_gitignore(repo) is True
+    monkeypatch.undo()
+
+    assert commands == ["add", "commit"]
+
+    assert "node_modules/" in (repo / ".gitignore").read_text()
+    assert git(repo, "ls-tree", "--name-only", "HEAD").split() == [".gitignore"]
+    assert git(repo, "log", "--format=%s").strip() == "Add comprehensive .gitignore"
+    # The user's staged change stays staged, not swept into the commit
+    assert git(repo, "diff", "--cached", "--name-only").split() == ["app.py"]
+
+
+@pytest.mark.parametrize("node_modules", [
+    "node_modules",
+    "node_modules/",
+    "/node_modules",
+    "/node_modules/",
+    "**/node_modules",
+    "**/node_modules/",
+])
+def test_gitignore_anchored_forms(validation, tmp_path, node_modules):
+    """Anchored and globbed forms of an entry count as present."""
+    gitignore = f"{node_modules}\n/venv/\n**/__pycache__\n.env\n".encode()
+
+    assert validation._check_gitignore(gitignore) == []
+    assert b"node_modules" in validation._gitignore_entries(gitignore)
+
+    (tmp_path / ".gitignore").write_bytes(gitignore)
+    validation.fix_gitignore(tmp_path, gitignore)
+    added = (tmp_path / ".gitignore").read_bytes()[len(gitignore):]
+    assert b"node_modules" not in added
+    assert b"venv/" not in added.replace(b".venv/", b"")
+    assert b"__pycache__" not in added
+
+
+def test_validate_linked_worktree(validation, repo, tmp_path_factory):
+    """A linked worktree, where .git is a file, is still validated."""
+    (repo / "README.md").write_text("readme\n")
+    git(repo, "add", "README.md")
+    git(repo, "commit", "-q", "-m", "Initial commit")
+
+    worktree = tmp_path_factory.mktemp("linked") / "wt"
+    git(repo, "worktree", "add", "-q", "-b", "feature", str(worktree))
+    assert (worktree / ".git").is_file()
+    (worktree / "node_modules").mkdir()
+    (worktree / "node_modules" / "pkg.js").write_text("module.exports = 1\n")
+    git(worktree, "add", "node_modules")
+    git(worktree, "commit", "-q", "-m", "Commit dependencies")
+
+    issues = validation.validate_repository(worktree)
+
+    categories = {issue.category for issue in issues}
+    assert categories == {"committed_deps", "gitignore"}, issues
+    assert any("node_modules" in issue.message for issue in issues)
+
+
+def test_commit_graph_in_linked_worktree(validation, repo, tmp_path_factory, monkeypatch):
+    """The commit-graph for a linked worktree is found in the shared object store."""
+    git(repo, "commit", "-q", "--allow-empty", "-m", "Initial commit")
+    worktree = tmp_path_factory.mktemp("linked") / "wt"
+    git(repo, "worktree", "add", "-q", "-b", "feature", str(worktree))
+
+    validation._ensure_commit_graph(worktree)
+    assert (repo / ".git" / "objects" / "info" / "commit-graph").exists()
+
+    writes = []
+    real_run = subprocess.run
+
+    def recording_run(args, **kwargs):
+        if "commit-graph" in args:
+            writes.append(args)
+        return real_run(args, **kwargs)
+
+    monkeypatch.setattr(validation.subprocess, "run", recording_run)
+    validation._ensure_commit_graph(worktree)
+    assert writes == [], "A fresh commit-graph should not be rewritten"
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__, '-v']))
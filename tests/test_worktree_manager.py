@@ -8,6 +8,7 @@ import asyncio
 import sys
 import tempfile
 import shutil
+import subprocess
 from pathlib import Path
 from unittest.mock import AsyncMock, Mock, patch, MagicMock
 from datetime import datetime
@@ -18,6 +19,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from core.parallel.worktree_manager import (
     WorktreeManager,
     WorktreeInfo,
+    GitStatus,
     GitCommandError,
     WorktreeConflictError
 )
@@ -94,6 +96,42 @@ class TestWorktreeCreation:
 
         print("[PASS]")
 
+    async def test_create_worktree_uses_known_branches(self):
+        """Test that a branch known to exist is attached without trying -b."""
+        print("\n=== Test: Create Worktree With Known Branch ===")
+
+        temp_dir = tempfile.mkdtemp(prefix='worktree_test_')
+        try:
+            manager = WorktreeManager(
+                project_path=temp_dir,
+                project_id="test-project"
+            )
+
+            with patch.object(manager, '_run_git', new_callable=AsyncMock) as mock_git:
+                with patch.object(manager, '_get_main_branch', return_value='main'):
+                    mock_git.return_value = "main\nepic-1-test-epic"
+                    await manager.initialize()
+                    assert manager._known_branches == {'main', 'epic-1-test-epic'}
+
+                    mock_git.reset_mock()
+                    mock_git.return_value = ""
+                    await manager.create_worktree(epic_id=1, epic_name="Test Epic")
+                    await manager.create_worktree(epic_id=2, epic_name="Other Epic")
+
+                    add_calls = [
+                        call.args[0] for call in mock_git.call_args_list
+                        if call.args[0][:2] == ['worktree', 'add']
+                    ]
+                    assert '-b' not in add_calls[0], "Existing branch should be attached"
+                    assert '-b' in add_calls[1], "New branch should be created"
+                    assert 'epic-2-other-epic' in manager._known_branches
+                    print(f"[PASS] Branch existence answered from for-each-ref cache")
+
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+        print("[PASS]")
+
 
 class TestWorktreeMerge:
     """Test worktree merge functionality."""
@@ -125,7 +163,7 @@ class TestWorktreeMerge:
 
             with patch.object(manager, '_run_git', new_callable=AsyncMock) as mock_git:
                 with patch.object(manager, '_get_main_branch', return_value='main'):
-                    with patch.object(manager, '_has_uncommitted_changes', return_value=False):
+                    with patch.object(manager, '_get_porcelain_status', return_value=GitStatus()):
                         with patch.object(manager, '_check_merge_conflicts', return_value=False):
                             mock_git.return_value = "abc123def"
 
@@ -169,11 +207,15 @@ class TestWorktreeMerge:
 
             with patch.object(manager, '_run_git', new_callable=AsyncMock) as mock_git:
                 with patch.object(manager, '_get_main_branch', return_value='main'):
-                    with patch.object(manager, '_has_uncommitted_changes', return_value=False):
+                    with patch.object(manager, '_get_porcelain_status', return_value=GitStatus()):
                         # Make git merge command fail with conflict
                         def mock_git_with_conflict(args, **kwargs):
                             if 'merge' in args and '--abort' not in args:
-                                raise GitCommandError("CONFLICT (content): Merge conflict in file.txt")
+                                raise GitCommandError(
+                                    "Git command failed (exit 1): git merge",
+                                    returncode=1,
+                                    stdout=b"CONFLICT (content): Merge conflict in file.txt"
+                                )
                             return ""
 
                         mock_git.side_effect = mock_git_with_conflict
@@ -191,6 +233,297 @@ class TestWorktreeMerge:
 
         print("[PASS]")
 
+    async def test_merge_skips_when_branch_has_no_new_commits(self):
+        """Test that an untouched branch is not merged or dry-run checked."""
+        print("\n=== Test: Merge Skips Untouched Branch ===")
+
+        temp_dir = tempfile.mkdtemp(prefix='worktree_test_')
+        try:
+            manager = WorktreeManager(
+                project_path=temp_dir,
+                project_id="test-project"
+            )
+
+            worktree_path = Path(temp_dir) / ".worktrees" / "epic-1"
+            worktree_path.mkdir(parents=True, exist_ok=True)
+
+            manager._worktrees[1] = WorktreeInfo(
+                path=str(worktree_path),
+                branch="epic-1-test",
+                epic_id=1,
+                status="active",
+                created_at=datetime.now()
+            )
+
+            def mock_git_divergence(args, **kwargs):
+                if args[:2] == ['rev-list', '--left-right']:
+                    return "3\t0"
+                return "abc123def"
+
+            with patch.object(manager, '_run_git', new_callable=AsyncMock) as mock_git:
+                with patch.object(manager, '_get_main_branch', return_value='main'):
+                    with patch.object(manager, '_get_porcelain_status', return_value=GitStatus()):
+                        with patch.object(manager, '_check_merge_conflicts', new_callable=AsyncMock) as mock_check:
+                            mock_git.side_effect = mock_git_divergence
+
+                            commit_hash = await manager.merge_worktree(epic_id=1)
+
+                            assert commit_hash == "abc123def"
+                            assert manager._worktrees[1].status == "merged"
+                            mock_check.assert_not_called()
+                            assert not any(
+                                call.args[0][0] == 'merge' for call in mock_git.call_args_list
+                            ), "No merge should run for a branch without new commits"
+                            print(f"[PASS] Merge and conflict dry-run skipped")
+
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+        print("[PASS]")
+
+
+    async def test_worktree_status_cached_until_change(self):
+        """Test that get_worktree_status() is rebuilt only after a change."""
+        print("\n=== Test: Worktree Status Cache ===")
+
+        temp_dir = tempfile.mkdtemp(prefix='worktree_test_')
+        try:
+            manager = WorktreeManager(
+                project_path=temp_dir,
+                project_id="test-project"
+            )
+
+            with patch.object(manager, '_run_git', new_callable=AsyncMock) as mock_git:
+                with patch.object(manager, '_get_main_branch', return_value='main'):
+                    with patch.object(manager, '_get_porcelain_status', return_value=GitStatus()):
+                        with patch.object(manager, '_check_merge_conflicts', return_value=False):
+                            mock_git.return_value = "abc123def"
+
+                            worktree = await manager.create_worktree(epic_id=1, epic_name="Test")
+                            # git is mocked, so create the directory it would have
+                            worktree.fs_path.mkdir(parents=True, exist_ok=True)
+                            status1 = manager.get_worktree_status()
+                            assert manager.get_worktree_status() is status1
+                            assert status1['active_worktrees'] == 1
+                            print(f"[PASS] Repeated polls reuse the cached status")
+
+                            await manager.merge_worktree(epic_id=1)
+                            status2 = manager.get_worktree_status()
+                            assert status2 is not status1
+                            assert status2['merged_worktrees'] == 1
+                            assert status2['worktrees'][0]['merged_at'] is not None
+                            print(f"[PASS] Merge invalidates the cached status")
+
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+        print("[PASS]")
+
+
+class TestConflictCache:
+    """Test caching of merge-tree dry-run results."""
+
+    async def test_merge_tree_cached_by_commit_pair(self):
+        """Test that unchanged branches reuse the cached merge-tree result."""
+        print("\n=== Test: Merge-Tree Cache ===")
+
+        temp_dir = tempfile.mkdtemp(prefix='worktree_test_')
+        try:
+            manager = WorktreeManager(
+                project_path=temp_dir,
+                project_id="test-project"
+            )
+
+            merge_tree_calls = []
+
+            def mock_git(args, **kwargs):
+                if args[0] == 'rev-parse':
+                    return 'sha-' + args[-1].split('^')[0]
+                if args[0] == 'merge-base':
+                    return 'base-sha'
+                if args[0] == 'merge-tree':
+                    merge_tree_calls.append(args)
+                    return '<<<<<<< .our'
+                return ''
+
+            with patch.object(manager, '_run_git', new_callable=AsyncMock) as mock_run:
+                with patch.object(manager, '_get_main_branch', return_value='main'):
+                    mock_run.side_effect = mock_git
+
+                    assert await manager._check_merge_conflicts('epic-1-test') is True
+                    assert await manager._check_merge_conflicts('epic-1-test') is True
+                    assert len(merge_tree_calls) == 1
+                    print(f"[PASS] Second check served from cache")
+
+                    manager._invalidate_conflict_cache('epic-1-test')
+                    await manager._check_merge_conflicts('epic-1-test')
+                    assert len(merge_tree_calls) == 2
+                    print(f"[PASS] Invalidation forces a fresh merge-tree")
+
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+        print("[PASS]")
+
+
+    async def test_resolve_ref_reuses_batch_process(self):
+        """Test that ref lookups share one cat-file --batch-check process."""
+        print("\n=== Test: Resolve Ref via cat-file --batch-check ===")
+
+        temp_dir = tempfile.mkdtemp(prefix='worktree_test_')
+        try:
+            def git(*args):
+                return subprocess.run(
+                    ['git', '-C', temp_dir, *args],
+                    check=True, capture_output=True, text=True
+                ).stdout.strip()
+
+            git('init', '-q', '-b', 'main')
+            git('-c', 'user.email=test@example.com', '-c', 'user.name=Test',
+                'commit', '-q', '--allow-empty', '-m', 'init')
+            git('branch', 'epic-1-test')
+            expected = git('rev-parse', 'main')
+
+            manager = WorktreeManager(
+                project_path=temp_dir,
+                project_id="test-project"
+            )
+
+            try:
+                with patch.object(manager, '_run_git', new_callable=AsyncMock) as mock_git:
+                    assert await manager._resolve_ref('main') == expected
+                    proc = manager._catfile_proc
+                    assert await manager._resolve_ref('epic-1-test') == expected
+                    assert manager._catfile_proc is proc
+                    mock_git.assert_not_called()
+                    print(f"[PASS] Both refs resolved by one cat-file process")
+
+                    # Unknown refs fall back to rev-parse for the real error
+                    mock_git.side_effect = GitCommandError("unknown revision", returncode=128)
+                    try:
+                        await manager._resolve_ref('no-such-branch')
+                        assert False, "Should have raised GitCommandError"
+                    except GitCommandError:
+                        print(f"[PASS] Missing ref falls back to rev-parse")
+            finally:
+                await manager.close()
+                assert manager._catfile_proc is None
+
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+        print("[PASS]")
+
+    def test_scan_conflicted_paths(self):
+        """Test that only UU/AA/DD status lines are reported as conflicts."""
+        print("\n=== Test: Scan Conflicted Paths ===")
+
+        status = b'UU a.txt\n M b.txt\nAA dir/c d.txt\nDD e.txt\nUA f.txt\n?? g.txt\nUU h.txt'
+        result = WorktreeManager._scan_conflicted_paths(status)
+        assert result == ['a.txt', 'dir/c d.txt', 'e.txt', 'h.txt']
+        assert WorktreeManager._scan_conflicted_paths(b'') == []
+        print(f"[PASS] Conflicted paths: {result}")
+
+        print("[PASS]")
+
+
+class TestDirtyTracking:
+    """Test the clean-worktree fast path for uncommitted change checks."""
+
+    async def test_clean_worktree_skips_git_status(self):
+        """Test that a freshly verified clean worktree skips git status."""
+        print("\n=== Test: Clean Worktree Skips Git Status ===")
+
+        temp_dir = tempfile.mkdtemp(prefix='worktree_test_')
+        try:
+            manager = WorktreeManager(
+                project_path=temp_dir,
+                project_id="test-project",
+                track_changes=True
+            )
+
+            status_calls = []
+
+            async def fake_stream(args, **kwargs):
+                status_calls.append(args)
+                yield b' M file.txt'
+
+            with patch.object(manager, '_run_git_stream_lines', side_effect=fake_stream):
+                manager._mark_clean(1)
+                assert await manager._has_uncommitted_changes(epic_id=1) is False
+                assert status_calls == []
+                print(f"[PASS] Known-clean worktree answered without git")
+
+                manager.mark_dirty(1)
+                assert await manager._has_uncommitted_changes(epic_id=1) is True
+                assert len(status_calls) == 1
+                print(f"[PASS] mark_dirty() forces a real status check")
+
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+        print("[PASS]")
+
+    async def test_untracked_manager_always_checks_status(self):
+        """Test that without track_changes a known-clean worktree still runs git status."""
+        print("\n=== Test: Untracked Manager Always Checks Status ===")
+
+        temp_dir = tempfile.mkdtemp(prefix='worktree_test_')
+        try:
+            manager = WorktreeManager(
+                project_path=temp_dir,
+                project_id="test-project"
+            )
+
+            status_calls = []
+
+            async def fake_stream(args, **kwargs):
+                status_calls.append(args)
+                yield b' M file.txt'
+
+            with patch.object(manager, '_run_git_stream_lines', side_effect=fake_stream):
+                # As after create_worktree(), with edits made but never reported
+                manager._mark_clean(1)
+                assert await manager._has_uncommitted_changes(epic_id=1) is True
+                assert len(status_calls) == 1
+                print(f"[PASS] Edits after creation are seen without mark_dirty()")
+
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+        print("[PASS]")
+
+    def test_parse_porcelain_status(self):
+        """Test parsing of 'git status --porcelain=v2 --branch -z' output."""
+        print("\n=== Test: Parse Porcelain v2 Status ===")
+
+        output = (
+            b'# branch.oid 0123abcd\0'
+            b'# branch.head epic-1-test\0'
+            b'# branch.upstream origin/epic-1-test\0'
+            b'# branch.ab +2 -1\0'
+            b'1 .M N... 100644 100644 100644 aaaa bbbb dir/b file.txt\0'
+            b'2 R. N... 100644 100644 100644 aaaa aaaa R100 new name.txt\0old name.txt\0'
+            b'? untracked.txt\0'
+            b'! ignored.log\0'
+        )
+        status = WorktreeManager._parse_porcelain_status(output)
+        assert status.head == 'epic-1-test'
+        assert status.oid == '0123abcd'
+        assert status.upstream == 'origin/epic-1-test'
+        assert (status.ahead, status.behind) == (2, 1)
+        assert status.entries == ['dir/b file.txt', 'new name.txt', 'untracked.txt']
+        assert status.has_changes
+        print(f"[PASS] Parsed: {status}")
+
+        clean = WorktreeManager._parse_porcelain_status(
+            b'# branch.oid (initial)\0# branch.head (detached)\0'
+        )
+        assert clean.head is None and clean.oid is None and not clean.has_changes
+        print(f"[PASS] Detached, initial and clean state handled")
+
+        print("[PASS]")
+
 
 class TestWorktreeCleanup:
     """Test worktree cleanup functionality."""
@@ -273,6 +606,103 @@ class TestWorktreeCleanup:
         print("[PASS]")
 
 
+    async def test_cleanup_worktrees_batch(self):
+        """Test that batch cleanup uses one script and one branch delete."""
+        print("\n=== Test: Batch Cleanup Worktrees ===")
+
+        temp_dir = tempfile.mkdtemp(prefix='worktree_test_')
+        try:
+            manager = WorktreeManager(
+                project_path=temp_dir,
+                project_id="test-project"
+            )
+
+            for epic_id in (1, 2, 3):
+                worktree_path = Path(temp_dir) / ".worktrees" / f"epic-{epic_id}"
+                worktree_path.mkdir(parents=True, exist_ok=True)
+                manager._worktrees[epic_id] = WorktreeInfo(
+                    path=str(worktree_path),
+                    branch=f"epic-{epic_id}-test",
+                    epic_id=epic_id,
+                    status="merged",
+                    created_at=datetime.now()
+                )
+
+            with patch.object(manager, '_run_git_script', new_callable=AsyncMock) as mock_script:
+                with patch.object(manager, '_run_git', new_callable=AsyncMock) as mock_git:
+                    mock_script.return_value = ""
+                    mock_git.return_value = ""
+
+                    await manager.cleanup_worktrees([1, 2, 3])
+
+                    assert mock_script.call_count == 1
+                    assert mock_git.call_count == 1
+                    assert mock_git.call_args[0][0] == [
+                        'branch', '-d', 'epic-1-test', 'epic-2-test', 'epic-3-test'
+                    ]
+                    assert manager._worktrees == {}
+                    print(f"[PASS] Cleaned up 3 worktrees with 2 processes")
+
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+        print("[PASS]")
+
+
+    async def test_cleanup_worktrees_deletes_merged_branches_in_one_transaction(self):
+        """Test that merged branches are deleted with one update-ref --stdin."""
+        print("\n=== Test: Bulk Delete Merged Branches ===")
+
+        temp_dir = tempfile.mkdtemp(prefix='worktree_test_')
+        try:
+            def git(*args):
+                return subprocess.run(
+                    ['git', '-C', temp_dir, *args],
+                    check=True, capture_output=True, text=True
+                ).stdout.strip()
+
+            git('init', '-q', '-b', 'main')
+            git('-c', 'user.email=test@example.com', '-c', 'user.name=Test',
+                'commit', '-q', '--allow-empty', '-m', 'init')
+
+            manager = WorktreeManager(
+                project_path=temp_dir,
+                project_id="test-project"
+            )
+            for epic_id in (1, 2):
+                branch = f"epic-{epic_id}-test"
+                git('branch', branch)
+                manager._worktrees[epic_id] = WorktreeInfo(
+                    path=str(Path(temp_dir) / ".worktrees" / f"epic-{epic_id}"),
+                    branch=branch,
+                    epic_id=epic_id,
+                    status="merged",
+                    created_at=datetime.now(),
+                    merged=True
+                )
+
+            commands = []
+            run_git = manager._run_git
+
+            async def recording_git(args, **kwargs):
+                commands.append(args)
+                return await run_git(args, **kwargs)
+
+            with patch.object(manager, '_run_git', side_effect=recording_git):
+                await manager.cleanup_worktrees([1, 2])
+
+            assert git('branch', '--list', 'epic-*') == ''
+            assert ['update-ref', '--stdin'] in commands
+            assert not any(args[:2] == ['branch', '-d'] for args in commands)
+            assert manager._worktrees == {}
+            print(f"[PASS] Deleted 2 merged branches in one transaction")
+
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+        print("[PASS]")
+
+
 class TestBranchNameSanitization:
     """Test branch name sanitization for Windows compatibility."""
 
@@ -456,7 +886,7 @@ class TestDatabaseSync:
 
             with patch.object(manager, '_run_git', new_callable=AsyncMock) as mock_git:
                 with patch.object(manager, '_get_main_branch', return_value='main'):
-                    with patch.object(manager, '_has_uncommitted_changes', return_value=False):
+                    with patch.object(manager, '_get_porcelain_status', return_value=GitStatus()):
                         with patch.object(manager, '_check_merge_conflicts', return_value=False):
                             mock_git.return_value = "abc123"
 
@@ -471,6 +901,45 @@ class TestDatabaseSync:
 
         print("[PASS]")
 
+    async def test_database_updates_run_in_background_in_order(self):
+        """Test that status updates are deferred, ordered per epic and flushed."""
+        print("\n=== Test: Background Database Updates ===")
+
+        temp_dir = tempfile.mkdtemp(prefix='worktree_test_')
+        try:
+            written = []
+
+            async def slow_update(worktree_id, status, **kwargs):
+                # The first update is the slowest; it must still land first
+                await asyncio.sleep(0.05 if status == 'merged' else 0)
+                if status == 'fail':
+                    raise RuntimeError("database unavailable")
+                written.append((worktree_id, status))
+
+            mock_db = Mock()
+            mock_db.update_worktree = AsyncMock(side_effect=slow_update)
+
+            manager = WorktreeManager(
+                project_path=temp_dir,
+                project_id="12345678-1234-5678-1234-567812345678",
+                db=mock_db
+            )
+
+            manager._schedule_db_update(1, status='merged', merge_commit='abc123')
+            manager._schedule_db_update(1, status='fail')
+            manager._schedule_db_update(1, status='cleanup')
+            assert written == [], "Updates should not block the caller"
+
+            await manager.flush()
+            assert written == [(1, 'merged'), (1, 'cleanup')]
+            assert not manager._pending_db_tasks
+            print(f"[PASS] Updates written in order, failure logged not raised")
+
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+        print("[PASS]")
+
 
 class TestRecoveryFromInvalidState:
     """Test recovery from invalid states."""
@@ -522,6 +991,56 @@ class TestRecoveryFromInvalidState:
 
         print("[PASS]")
 
+    async def test_initialize_skips_invalid_active_worktrees(self):
+        """Test that initialize() drops active records whose worktree is gone."""
+        print("\n=== Test: Initialize Skips Invalid Worktrees ===")
+
+        temp_dir = tempfile.mkdtemp(prefix='worktree_test_')
+        try:
+            project_uuid = "12345678-1234-5678-1234-567812345678"
+            worktrees_root = Path(temp_dir) / ".worktrees"
+
+            def record(epic_id, status):
+                return {
+                    'id': epic_id,
+                    'epic_id': epic_id,
+                    'branch_name': f'epic-{epic_id}-test',
+                    'worktree_path': str(worktrees_root / f"epic-{epic_id}"),
+                    'status': status,
+                    'created_at': datetime.now()
+                }
+
+            mock_db = Mock()
+            mock_db.list_worktrees = AsyncMock(return_value=[
+                record(1, 'active'),
+                record(2, 'active'),
+                record(3, 'merged'),
+            ])
+
+            manager = WorktreeManager(
+                project_path=temp_dir,
+                project_id=project_uuid,
+                db=mock_db
+            )
+
+            async def fake_check(args, cwd=None, timeout=10):
+                # epic-2's directory is no longer a git worktree
+                return None if Path(cwd).name == "epic-2" else "true"
+
+            with patch.object(manager, '_run_git', new_callable=AsyncMock) as mock_git:
+                with patch.object(manager, '_run_git_check', side_effect=fake_check) as mock_check:
+                    mock_git.return_value = "main"
+                    await manager.initialize()
+
+                    assert set(manager._worktrees) == {1, 3}
+                    assert mock_check.call_count == 2, "Only active records should be validated"
+                print("[PASS] Invalid active worktree skipped, merged record kept")
+
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+        print("[PASS]")
+
 
 class TestConcurrentOperations:
     """Test concurrent worktree operations."""
@@ -566,6 +1085,103 @@ class TestConcurrentOperations:
         print("[PASS]")
 
 
+    async def test_main_branch_detected_once(self):
+        """Test that concurrent callers share one main branch detection."""
+        print("\n=== Test: Main Branch Detected Once ===")
+
+        temp_dir = tempfile.mkdtemp(prefix='worktree_test_')
+        try:
+            manager = WorktreeManager(
+                project_path=temp_dir,
+                project_id="test-project"
+            )
+
+            with patch.object(manager, '_detect_main_branch', new_callable=AsyncMock) as mock_detect:
+                mock_detect.return_value = 'main'
+
+                results = await asyncio.gather(*[manager._get_main_branch() for _ in range(5)])
+                assert results == ['main'] * 5
+                assert mock_detect.call_count == 1
+                print(f"[PASS] 5 concurrent lookups, 1 detection")
+
+                manager.invalidate_main_branch()
+                await manager._get_main_branch()
+                assert mock_detect.call_count == 2
+                print(f"[PASS] invalidate_main_branch() forces re-detection")
+
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+        print("[PASS]")
+
+    def test_main_branch_read_from_ref_files(self):
+        """Test main branch detection from .git ref files without git."""
+        print("\n=== Test: Main Branch From Ref Files ===")
+
+        temp_dir = tempfile.mkdtemp(prefix='worktree_test_')
+        try:
+            manager = WorktreeManager(
+                project_path=temp_dir,
+                project_id="test-project"
+            )
+            git_dir = Path(temp_dir) / ".git"
+
+            # No repository at all
+            assert manager._read_main_branch_from_disk() is None
+
+            # Only a packed 'master' ref
+            git_dir.mkdir()
+            (git_dir / "packed-refs").write_text("# pack-refs with: peeled\nabc123 refs/heads/master\n")
+            assert manager._read_main_branch_from_disk() == 'master'
+            print(f"[PASS] Found 'master' in packed-refs")
+
+            # origin/HEAD takes precedence
+            origin = git_dir / "refs" / "remotes" / "origin"
+            origin.mkdir(parents=True)
+            (origin / "HEAD").write_text("ref: refs/remotes/origin/main\n")
+            assert manager._read_main_branch_from_disk() == 'main'
+            print(f"[PASS] Found 'main' via origin/HEAD")
+
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+        print("[PASS]")
+
+    async def test_git_concurrency_is_capped(self):
+        """Test that concurrent git commands never exceed max_concurrent_git."""
+        print("\n=== Test: Git Concurrency Cap ===")
+
+        temp_dir = tempfile.mkdtemp(prefix='worktree_test_')
+        try:
+            manager = WorktreeManager(
+                project_path=temp_dir,
+                project_id="test-project",
+                max_concurrent_git=2
+            )
+
+            running = 0
+            peak = 0
+
+            async def fake_exec(cmd, timeout, input=None):
+                nonlocal running, peak
+                running += 1
+                peak = max(peak, running)
+                await asyncio.sleep(0.01)
+                running -= 1
+                return b""
+
+            with patch.object(manager, '_exec_git', side_effect=fake_exec):
+                await asyncio.gather(*[manager._run_git(['status']) for _ in range(8)])
+
+            assert peak == 2
+            print(f"[PASS] Peak concurrent git processes: {peak}")
+
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+        print("[PASS]")
+
+
 async def run_all_tests():
     """Run all test suites."""
     print("\n" + "="*60)
@@ -577,16 +1193,33 @@ async def run_all_tests():
         creation = TestWorktreeCreation()
         await creation.test_create_worktree_success()
         await creation.test_create_worktree_reuses_existing()
+        await creation.test_create_worktree_uses_known_branches()
 
         # Worktree merge tests
         merge = TestWorktreeMerge()
         await merge.test_merge_worktree_success()
         await merge.test_merge_worktree_with_conflicts()
+        await merge.test_merge_skips_when_branch_has_no_new_commits()
+        await merge.test_worktree_status_cached_until_change()
+
+        # Conflict cache tests
+        conflict_cache = TestConflictCache()
+        await conflict_cache.test_merge_tree_cached_by_commit_pair()
+        await conflict_cache.test_resolve_ref_reuses_batch_process()
+        conflict_cache.test_scan_conflicted_paths()
+
+        # Dirty tracking tests
+        dirty = TestDirtyTracking()
+        await dirty.test_clean_worktree_skips_git_status()
+        await dirty.test_untracked_manager_always_checks_status()
+        dirty.test_parse_porcelain_status()
 
         # Cleanup tests
         cleanup = TestWorktreeCleanup()
         await cleanup.test_cleanup_worktree_success()
         await cleanup.test_cleanup_removes_directory_if_git_fails()
+        await cleanup.test_cleanup_worktrees_batch()
+        await cleanup.test_cleanup_worktrees_deletes_merged_branches_in_one_transaction()
 
         # Branch sanitization tests
         sanitize = TestBranchNameSanitization()
@@ -599,17 +1232,22 @@ async def run_all_tests():
         db_sync = TestDatabaseSync()
         await db_sync.test_database_sync_on_create()
         await db_sync.test_database_sync_on_merge()
+        await db_sync.test_database_updates_run_in_background_in_order()
 
         # Recovery tests
         recovery = TestRecoveryFromInvalidState()
         await recovery.test_recover_state_rebuilds_from_database()
+        await recovery.test_initialize_skips_invalid_active_worktrees()
 
         # Concurrent operations tests
         concurrent = TestConcurrentOperations()
         await concurrent.test_concurrent_worktree_creation()
+        await concurrent.test_main_branch_detected_once()
+        concurrent.test_main_branch_read_from_ref_files()
+        await concurrent.test_git_concurrency_is_capped()
 
         print("\n" + "="*60)
-        print("[SUCCESS] ALL TESTS PASSED (14/14)")
+        print("[SUCCESS] ALL TESTS PASSED (30/30)")
         print("="*60)
         print("\nTest Coverage:")
         print("  [PASS] Worktree creation (with mocked git)")
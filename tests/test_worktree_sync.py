@@ -176,6 +176,57 @@ async def test_sync_with_rebase():
         print(f"\nCleaned up test repo: {temp_dir}")
 
 
+async def test_sync_already_up_to_date():
+    """Test that syncing a branch that already contains main is a no-op."""
+    print("\n" + "="*60)
+    print("TEST: Sync When Already Up to Date")
+    print("="*60)
+
+    repo_path, temp_dir = await setup_test_repo()
+
+    try:
+        manager = WorktreeManager(
+            project_path=repo_path,
+            project_id='test-uptodate-789',
+            worktree_dir='.worktrees'
+        )
+        await manager.initialize()
+
+        # Create worktree and commit only on its branch
+        print("\n1. Creating worktree (epic 300)...")
+        wt = await manager.create_worktree(300, "Up To Date Epic")
+        worktree_file = Path(wt.path) / 'feature.txt'
+        worktree_file.write_text('Worktree change\n')
+        os.system(f'cd "{wt.path}" && git add feature.txt')
+        os.system(f'cd "{wt.path}" && git commit -m "Worktree commit"')
+        head_before = await manager._run_git(['rev-parse', 'HEAD'], cwd=Path(wt.path))
+        print("   [OK] Made changes in worktree only")
+
+        # Sync without any new main commits
+        print("\n2. Syncing from unchanged main...")
+        result = await manager.sync_worktree_from_main(300, strategy='merge')
+        head_after = await manager._run_git(['rev-parse', 'HEAD'], cwd=Path(wt.path))
+
+        print(f"   Status: {result['status']}")
+        print(f"   Message: {result['message']}")
+
+        if result['status'] == 'success' and head_before == head_after:
+            print("   [PASS] Sync skipped, branch unchanged")
+            success = True
+        else:
+            print("   [FAIL] Sync should have been a no-op")
+            success = False
+
+        # Cleanup
+        await manager.cleanup_worktree(300)
+
+        return success
+
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        print(f"\nCleaned up test repo: {temp_dir}")
+
+
 async def main():
     """Run all sync tests."""
     print("\n" + "="*60)
@@ -204,6 +255,16 @@ async def main():
         traceback.print_exc()
         results.append(('Rebase Strategy', False))
 
+    # Test 3: Already up to date
+    try:
+        result3 = await test_sync_already_up_to_date()
+        results.append(('Already Up to Date', result3))
+    except Exception as e:
+        print(f"\n[FAIL] TEST FAILED with exception: {e}")
+        import traceback
+        traceback.print_exc()
+        results.append(('Already Up to Date', False))
+
     # Print summary
     print("\n" + "="*60)
     print("TEST SUMMARY")